@@ -42,12 +42,15 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id')
     )
     
-    op.create_index('ix_drafts_user_id', 'drafts', ['user_id'])
-    op.create_index('ix_drafts_status', 'drafts', ['status'])
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_drafts_user_id', 'drafts', ['user_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_drafts_status', 'drafts', ['status'], postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
-    op.drop_index('ix_drafts_status', table_name='drafts')
-    op.drop_index('ix_drafts_user_id', table_name='drafts')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_drafts_status', table_name='drafts', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_drafts_user_id', table_name='drafts', postgresql_concurrently=True, if_exists=True)
     op.drop_table('drafts')
     op.execute("DROP TYPE draftstatus")
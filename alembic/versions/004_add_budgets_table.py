@@ -32,9 +32,12 @@ def upgrade() -> None:
         sa.Column('created_at', sa.DateTime, server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime, server_default=sa.text('now()'), nullable=False),
     )
-    op.create_index('ix_budgets_user_id', 'budgets', ['user_id'])
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_budgets_user_id', 'budgets', ['user_id'], postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
-    op.drop_index('ix_budgets_user_id')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_budgets_user_id', table_name='budgets', postgresql_concurrently=True, if_exists=True)
     op.drop_table('budgets')
@@ -0,0 +1,41 @@
+"""Add indexes on transactions
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Budget progress: user_id + type + date range
+        op.create_index(
+            'ix_transactions_user_type_date', 'transactions',
+            ['user_id', 'type', sa.text('date DESC')],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Foreign keys PostgreSQL doesn't index on its own (debt lookups, ON DELETE SET NULL)
+        op.create_index(
+            'ix_transactions_contact_id', 'transactions', ['contact_id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_transactions_linked_transaction_id', 'transactions', ['linked_transaction_id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_linked_transaction_id', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_contact_id', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_user_type_date', table_name='transactions', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""Add trigram index on transactions.category
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Spending limits match categories with a leading-wildcard ILIKE,
+    # which only a trigram index can serve
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_category_trgm', 'transactions', ['category'],
+            postgresql_using='gin', postgresql_ops={'category': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_category_trgm', table_name='transactions', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,55 @@
+"""Convert native enum columns to varchar with check constraints
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, enum type, allowed values)
+ENUM_COLUMNS = [
+    ('transactions', 'type', 'transactiontype', (
+        'expense', 'income', 'transfer', 'credit_receivable', 'credit_payable',
+        'loan_receivable', 'loan_payable', 'payment_received', 'payment_made'
+    )),
+    ('transactions', 'account', 'accounttype', ('cash', 'bank')),
+    ('transactions', 'status', 'debtstatus', ('open', 'partial', 'settled')),
+    ('messages', 'role', 'messagerole', ('user', 'assistant')),
+    ('drafts', 'status', 'draftstatus', ('pending', 'confirmed', 'discarded')),
+]
+
+
+def _in_list(values) -> str:
+    return ", ".join(f"'{value}'" for value in values)
+
+
+def upgrade() -> None:
+    for table, column, type_name, values in ENUM_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar(32) USING {column}::text"
+        )
+        op.create_check_constraint(
+            f'ck_{table}_{column}', table, f"{column} IN ({_in_list(values)})"
+        )
+    
+    for type_name in {type_name for _, _, type_name, _ in ENUM_COLUMNS}:
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade() -> None:
+    created = set()
+    for table, column, type_name, values in ENUM_COLUMNS:
+        if type_name not in created:
+            op.execute(f"CREATE TYPE {type_name} AS ENUM ({_in_list(values)})")
+            created.add(type_name)
+        op.drop_constraint(f'ck_{table}_{column}', table, type_='check')
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}"
+        )
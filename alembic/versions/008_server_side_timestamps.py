@@ -0,0 +1,43 @@
+"""Server-side defaults and NOT NULL for created_at/updated_at
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+TIMESTAMP_COLUMNS = {
+    'users': ['created_at', 'updated_at'],
+    'contacts': ['created_at', 'updated_at'],
+    'transactions': ['created_at', 'updated_at'],
+    'messages': ['created_at'],
+    'drafts': ['created_at', 'updated_at'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        # Backfill rows written before the columns were required
+        if 'updated_at' in columns:
+            op.execute(f"UPDATE {table} SET created_at = coalesce(created_at, updated_at, now()), updated_at = coalesce(updated_at, created_at, now()) WHERE created_at IS NULL OR updated_at IS NULL")
+        else:
+            op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+        
+        for column in columns:
+            op.alter_column(table, column, server_default=sa.text('now()'), nullable=False)
+
+
+def downgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            # drafts already had its server defaults before this revision
+            server_default = sa.text('now()') if table == 'drafts' else None
+            op.alter_column(table, column, server_default=server_default, nullable=True)
@@ -0,0 +1,31 @@
+"""Add partial index on active budgets
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Budget list: a user's active budgets, newest first
+        op.create_index(
+            'ix_budgets_user_active', 'budgets',
+            ['user_id', sa.text('created_at DESC')],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_budgets_user_active', table_name='budgets', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+"""Cover amount and category in the budget aggregation index
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Budget progress sums amount (and matches category) straight from the index
+        op.create_index(
+            'ix_transactions_user_type_date_covering', 'transactions',
+            ['user_id', 'type', sa.text('date DESC')],
+            postgresql_include=['amount', 'category'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Same key columns, so the uncovered index from 005 is redundant
+        op.drop_index('ix_transactions_user_type_date', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_user_type_date', 'transactions',
+            ['user_id', 'type', sa.text('date DESC')],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_transactions_user_type_date_covering', table_name='transactions', postgresql_concurrently=True, if_exists=True)
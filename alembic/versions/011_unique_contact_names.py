@@ -0,0 +1,69 @@
+"""Unique case-insensitive contact names per user
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Merge duplicates onto the oldest contact of each (user, lower(name)) group
+    op.execute("""
+        CREATE TEMPORARY TABLE contact_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY user_id, lower(name) ORDER BY created_at, id
+            ) AS keep_id
+            FROM contacts
+        ) ranked
+        WHERE id <> keep_id
+    """)
+    op.execute("""
+        UPDATE transactions SET contact_id = d.keep_id
+        FROM contact_duplicates d WHERE transactions.contact_id = d.id
+    """)
+    op.execute("""
+        UPDATE drafts SET contact_id = d.keep_id
+        FROM contact_duplicates d WHERE drafts.contact_id = d.id
+    """)
+    # Carry the duplicates' details over wherever the kept contact has none,
+    # taking the oldest duplicate's value first
+    op.execute("""
+        UPDATE contacts k SET
+            phone = coalesce(k.phone, m.phone),
+            email = coalesce(k.email, m.email),
+            note = coalesce(k.note, m.note)
+        FROM (
+            SELECT d.keep_id,
+                (array_agg(c.phone ORDER BY c.created_at, c.id) FILTER (WHERE c.phone IS NOT NULL))[1] AS phone,
+                (array_agg(c.email ORDER BY c.created_at, c.id) FILTER (WHERE c.email IS NOT NULL))[1] AS email,
+                (array_agg(c.note ORDER BY c.created_at, c.id) FILTER (WHERE c.note IS NOT NULL))[1] AS note
+            FROM contact_duplicates d JOIN contacts c ON c.id = d.id
+            GROUP BY d.keep_id
+        ) m
+        WHERE k.id = m.keep_id
+    """)
+    op.execute("DELETE FROM contacts USING contact_duplicates d WHERE contacts.id = d.id")
+    
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_user_lower_name', 'contacts',
+            ['user_id', sa.text('lower(name)')],
+            unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    # Merged duplicate contacts are not restored; only the index is dropped
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contacts_user_lower_name', table_name='contacts', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""Add lowercased contact name column
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'contacts',
+        sa.Column('name_ci', sa.String(255), sa.Computed('lower(name)', persisted=True), nullable=False)
+    )
+    
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Name uniqueness and upserts now key on the stored column
+        op.create_index(
+            'ix_contacts_user_name_ci', 'contacts', ['user_id', 'name_ci'],
+            unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_contacts_user_lower_name', table_name='contacts', postgresql_concurrently=True, if_exists=True)
+        # Contact search is a leading-wildcard LIKE
+        op.create_index(
+            'ix_contacts_name_ci_trgm', 'contacts', ['name_ci'],
+            postgresql_using='gin', postgresql_ops={'name_ci': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contacts_name_ci_trgm', table_name='contacts', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'ix_contacts_user_lower_name', 'contacts',
+            ['user_id', sa.text('lower(name)')],
+            unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_contacts_user_name_ci', table_name='contacts', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('contacts', 'name_ci')
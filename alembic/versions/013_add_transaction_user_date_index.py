@@ -0,0 +1,30 @@
+"""Add (user_id, date DESC) index on transactions
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Insights and transaction lists read a user's rows newest first
+        op.create_index(
+            'ix_transactions_user_date', 'transactions',
+            ['user_id', sa.text('date DESC')],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_user_date', table_name='transactions', postgresql_concurrently=True, if_exists=True)
@@ -1,35 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
+from typing import List
 
-from app.core.database import get_db
-from app.models.user import User
 from app.schemas.ai import AIParseRequest, AIParseResponse, ParsedTransaction
 from app.services.gemini_service import parse_financial_input
-from app.api.deps import get_current_user
+from app.api.deps import UserClaims, get_current_user_claims
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
+# Validates a whole AI reply in one pass instead of one model per transaction
+_parsed_transactions = TypeAdapter(List[ParsedTransaction])
+
+# AI response key -> ParsedTransaction field
+_AI_TRANSACTION_FIELDS = {
+    "amount": "amount",
+    "description": "description",
+    "category": "category",
+    "type": "type",
+    "account": "account",
+    "contact": "contact",
+    "date": "date",  # Transaction occurring date from AI
+    "dueDate": "due_date",
+    "interestRate": "interest_rate",
+    "termMonths": "term_months",
+    "linkedTransactionId": "linked_transaction_id",
+}
+
+# Used when the AI leaves a required field out
+_AI_TRANSACTION_DEFAULTS = {
+    "amount": 0,
+    "description": "",
+    "type": "expense",
+    "account": "cash",
+}
+
 
 @router.post("/parse", response_model=AIParseResponse)
 async def parse_input(
     request: AIParseRequest,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_user_claims)
 ):
     try:
-        # Convert attachments to dict format
-        attachments = None
-        if request.attachments:
-            attachments = [
-                {
-                    "type": att.type.value,
-                    "mime_type": att.mime_type,
-                    "data_url": att.data_url,
-                    "name": att.name
-                }
-                for att in request.attachments
-            ]
-        
         result = await parse_financial_input(
             input_text=request.input_text,
             history=request.history,
@@ -38,25 +49,16 @@ async def parse_input(
             currency_code=request.currency_code or current_user.preferred_currency,
             currency_symbol=request.currency_symbol or "$",
             language_code=request.language_code or current_user.preferred_language,
-            attachments=attachments
+            attachments=request.attachments
         )
         
-        transactions = [
-            ParsedTransaction(
-                amount=tx.get("amount", 0),
-                description=tx.get("description", ""),
-                category=tx.get("category"),
-                type=tx.get("type", "expense"),
-                account=tx.get("account", "cash"),
-                contact=tx.get("contact"),
-                date=tx.get("date"),  # Transaction occurring date from AI
-                due_date=tx.get("dueDate"),
-                interest_rate=tx.get("interestRate"),
-                term_months=tx.get("termMonths"),
-                linked_transaction_id=tx.get("linkedTransactionId")
-            )
+        transactions = _parsed_transactions.validate_python([
+            {
+                **_AI_TRANSACTION_DEFAULTS,
+                **{field: tx[key] for key, field in _AI_TRANSACTION_FIELDS.items() if key in tx}
+            }
             for tx in result.get("transactions", [])
-        ]
+        ])
         
         return AIParseResponse(
             transactions=transactions,
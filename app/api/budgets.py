@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy.orm import raiseload
+from sqlalchemy import select, update, delete, and_, or_, func, case, bindparam
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime, timedelta
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.cache import response_cache
+from app.core.etag import make_etag, etag_day, etag_matches
 from app.models.user import User
 from app.models.budget import Budget, BudgetType, BudgetPeriod
 from app.models.transaction import Transaction, TransactionType
@@ -46,8 +50,8 @@ class BudgetResponse(BaseModel):
     is_active: bool
     is_over_budget: bool
     status: str  # on_track, warning, over_budget, achieved
-    period_start: Optional[str]
-    created_at: str
+    period_start: Optional[datetime]
+    created_at: datetime
 
     class Config:
         from_attributes = True
@@ -58,7 +62,8 @@ def get_period_start(period: str) -> datetime:
     now = datetime.utcnow()
     if period == "weekly":
         # Start of current week (Monday)
-        return now - timedelta(days=now.weekday())
+        week_start = now - timedelta(days=now.weekday())
+        return week_start.replace(hour=0, minute=0, second=0, microsecond=0)
     elif period == "monthly":
         return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     elif period == "yearly":
@@ -66,33 +71,104 @@ def get_period_start(period: str) -> datetime:
     return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
 
-async def calculate_budget_progress(
-    db: AsyncSession,
-    budget: Budget,
-    user_id: UUID
-) -> tuple[float, str]:
-    """Calculate current progress for a budget based on transactions."""
-    period_start = get_period_start(budget.period)
-    
-    # Build query based on budget type
+# date_trunc units for each budget period; unknown periods fall back to monthly
+PERIOD_TRUNC_UNITS = {
+    "weekly": "week",
+    "monthly": "month",
+    "yearly": "year",
+}
+
+
+def _truncate_now(unit):
+    # Transaction dates are stored as naive UTC, so truncate now() in UTC
+    return func.date_trunc(unit, func.timezone("UTC", func.now()))
+
+
+def period_start_clause(period: str):
+    """SQL expression for the start of the current period, evaluated by the database."""
+    return _truncate_now(PERIOD_TRUNC_UNITS.get(period, "month"))
+
+
+# Net = Income - Expenses, summed in a single pass
+_NET_AMOUNT = case(
+    (Transaction.type == TransactionType.income, Transaction.amount),
+    else_=-Transaction.amount
+)
+
+
+def _spending_limit_total(period_start, category_pattern):
+    # Sum expenses in this category
+    condition = and_(
+        Transaction.type == TransactionType.expense,
+        Transaction.date >= period_start
+    )
+    if category_pattern is not None:
+        condition = and_(condition, Transaction.category.ilike(category_pattern))
+    return condition, Transaction.amount
+
+
+def _income_goal_total(period_start, category_pattern):
+    # Sum income
+    condition = and_(
+        Transaction.type == TransactionType.income,
+        Transaction.date >= period_start
+    )
+    return condition, Transaction.amount
+
+
+def _net_total(period_start, category_pattern):
+    condition = and_(
+        Transaction.type.in_([TransactionType.income, TransactionType.expense]),
+        Transaction.date >= period_start
+    )
+    return condition, _NET_AMOUNT
+
+
+_BUDGET_TOTALS = {
+    BudgetType.spending_limit: _spending_limit_total,
+    BudgetType.income_goal: _income_goal_total,
+    BudgetType.savings_goal: _net_total,
+    BudgetType.profit_goal: _net_total,
+}
+
+
+def _category_pattern(budget: Budget) -> Optional[str]:
+    # Only spending limits are scoped to a category
+    if budget.type == BudgetType.spending_limit and budget.category:
+        return f"%{budget.category}%"
+    return None
+
+
+def _budget_total(budget: Budget):
+    """Build the row condition and summed amount for transactions that count towards a budget."""
+    build_total = _BUDGET_TOTALS.get(budget.type)
+    if build_total is None:
+        return None
+    return build_total(period_start_clause(budget.period), _category_pattern(budget))
+
+
+def _progress_statement(build_total, with_category: bool):
+    condition, amount = build_total(
+        _truncate_now(bindparam("unit")),
+        bindparam("category") if with_category else None
+    )
+    return select(func.coalesce(func.sum(amount), 0.0)).where(
+        and_(Transaction.user_id == bindparam("user_id"), condition)
+    )
+
+
+# Single-budget progress statements, built once and reused with bound parameters
+_PROGRESS_STATEMENTS = {
+    (budget_type, with_category): _progress_statement(build_total, with_category)
+    for budget_type, build_total in _BUDGET_TOTALS.items()
+    for with_category in (False, True)
+}
+
+
+def _budget_status(budget: Budget, total: float) -> tuple[float, str]:
+    """Turn a budget's transaction total into its current amount and status."""
     if budget.type == 'spending_limit':
-        # Sum expenses in this category
-        query = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.expense,
-                Transaction.date >= period_start
-            )
-        )
-        if budget.category:
-            query = query.where(
-                Transaction.category.ilike(f"%{budget.category}%")
-            )
-        
-        result = await db.execute(query)
-        transactions = result.scalars().all()
-        current = sum(t.amount for t in transactions)
-        
+        current = total
         progress = (current / budget.amount * 100) if budget.amount > 0 else 0
         if progress >= 100:
             status = "over_budget"
@@ -100,74 +176,9 @@ async def calculate_budget_progress(
             status = "warning"
         else:
             status = "on_track"
-            
-    elif budget.type == 'income_goal':
-        # Sum income
-        query = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.income,
-                Transaction.date >= period_start
-            )
-        )
-        result = await db.execute(query)
-        transactions = result.scalars().all()
-        current = sum(t.amount for t in transactions)
-        
-        progress = (current / budget.amount * 100) if budget.amount > 0 else 0
-        status = "achieved" if progress >= 100 else "on_track"
-        
-    elif budget.type == 'savings_goal':
-        # Savings = Income - Expenses
-        income_query = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.income,
-                Transaction.date >= period_start
-            )
-        )
-        expense_query = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.expense,
-                Transaction.date >= period_start
-            )
-        )
-        
-        income_result = await db.execute(income_query)
-        expense_result = await db.execute(expense_query)
-        
-        total_income = sum(t.amount for t in income_result.scalars().all())
-        total_expense = sum(t.amount for t in expense_result.scalars().all())
-        current = max(0, total_income - total_expense)
-        
-        progress = (current / budget.amount * 100) if budget.amount > 0 else 0
-        status = "achieved" if progress >= 100 else "on_track"
-        
-    elif budget.type == 'profit_goal':
-        # Profit = Income - Expenses (can be negative)
-        income_query = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.income,
-                Transaction.date >= period_start
-            )
-        )
-        expense_query = select(Transaction).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.expense,
-                Transaction.date >= period_start
-            )
-        )
-        
-        income_result = await db.execute(income_query)
-        expense_result = await db.execute(expense_query)
-        
-        total_income = sum(t.amount for t in income_result.scalars().all())
-        total_expense = sum(t.amount for t in expense_result.scalars().all())
-        current = total_income - total_expense
-        
+    elif budget.type in ('income_goal', 'savings_goal', 'profit_goal'):
+        # Savings can't go below zero, profit can be negative
+        current = max(0, total) if budget.type == 'savings_goal' else total
         progress = (current / budget.amount * 100) if budget.amount > 0 else 0
         status = "achieved" if progress >= 100 else "on_track"
     else:
@@ -177,42 +188,149 @@ async def calculate_budget_progress(
     return current, status
 
 
+async def calculate_budgets_progress(
+    db: AsyncSession,
+    budgets: List[Budget],
+    user_id: UUID
+) -> dict[UUID, tuple[float, str]]:
+    """Calculate progress for several budgets with a single aggregate query."""
+    totals = {}
+    for budget in budgets:
+        total = _budget_total(budget)
+        if total is not None:
+            totals[budget.id] = total
+    
+    # One row back, one column per budget. The WHERE clause keeps every
+    # budget's condition so the planner can use the transaction indexes.
+    amounts = {}
+    if totals:
+        query = select(*[
+            func.coalesce(func.sum(amount).filter(condition), 0.0)
+            for condition, amount in totals.values()
+        ]).where(
+            and_(
+                Transaction.user_id == user_id,
+                or_(*[condition for condition, _ in totals.values()])
+            )
+        )
+        result = await db.execute(query)
+        amounts = dict(zip(totals, result.one()))
+    
+    return {
+        budget.id: _budget_status(budget, amounts.get(budget.id, 0))
+        for budget in budgets
+    }
+
+
+async def calculate_budget_progress(
+    db: AsyncSession,
+    budget: Budget,
+    user_id: UUID
+) -> tuple[float, str]:
+    """Calculate current progress for a budget based on transactions."""
+    category_pattern = _category_pattern(budget)
+    statement = _PROGRESS_STATEMENTS.get((budget.type, category_pattern is not None))
+    if statement is None:
+        return _budget_status(budget, 0)
+    
+    params = {"user_id": user_id, "unit": PERIOD_TRUNC_UNITS.get(budget.period, "month")}
+    if category_pattern is not None:
+        params["category"] = category_pattern
+    
+    result = await db.execute(statement, params)
+    return _budget_status(budget, result.scalar())
+
+
+def _budget_response(
+    budget: Budget,
+    current_amount: float,
+    budget_status: str,
+    period_start: Optional[datetime]
+) -> dict:
+    """Build the BudgetResponse payload for a budget and its computed progress."""
+    progress = (current_amount / budget.amount * 100) if budget.amount > 0 else 0
+    return {
+        "id": str(budget.id),
+        "name": budget.name,
+        "type": budget.type,
+        "category": budget.category,
+        "amount": budget.amount,
+        "period": budget.period,
+        "current_amount": round(current_amount, 2),
+        "progress_percent": round(progress, 1),
+        "alert_at_percent": budget.alert_at_percent,
+        "is_active": budget.is_active,
+        "is_over_budget": progress >= 100 and budget.type == 'spending_limit',
+        "status": budget_status,
+        "period_start": period_start,
+        "created_at": budget.created_at,
+    }
+
+
+# raiseload turns any accidental per-budget relationship access into an error, not an N+1
+_LIST_ALL_BUDGETS = (
+    select(Budget)
+    .options(raiseload("*"))
+    .where(Budget.user_id == bindparam("user_id"))
+    .order_by(Budget.created_at.desc())
+)
+_LIST_ACTIVE_BUDGETS = _LIST_ALL_BUDGETS.where(Budget.is_active)
+
+_BUDGETS_FINGERPRINT = select(
+    select(
+        func.count(Transaction.id), func.max(Transaction.updated_at)
+    ).where(Transaction.user_id == bindparam("user_id")).subquery(),
+    select(
+        func.count(Budget.id), func.max(Budget.updated_at)
+    ).where(Budget.user_id == bindparam("user_id")).subquery()
+)
+
+
+async def get_budgets_etag(db: AsyncSession, user_id: UUID) -> str:
+    """Fingerprint everything the budget list depends on with one cheap query."""
+    result = await db.execute(_BUDGETS_FINGERPRINT, {"user_id": user_id})
+    # Counts catch deletes, max(updated_at) catches inserts and edits,
+    # and the date rolls the tag over when a new period starts
+    return make_etag(*result.one(), etag_day())
+
+
 @router.get("", response_model=List[BudgetResponse])
 async def get_budgets(
+    request: Request,
+    include_inactive: bool = Query(False, description="Include inactive budgets"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all budgets for the current user with progress."""
+    """Get the current user's budgets with progress (active only by default)."""
+    etag = await get_budgets_etag(db, current_user.id)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    # The etag changes with the data, so budget writes never need to clear this
+    cache_key = f"budgets:{current_user.id}:{int(include_inactive)}:{etag}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers={"ETag": etag})
+    
     result = await db.execute(
-        select(Budget)
-        .where(Budget.user_id == current_user.id)
-        .order_by(Budget.created_at.desc())
+        _LIST_ALL_BUDGETS if include_inactive else _LIST_ACTIVE_BUDGETS,
+        {"user_id": current_user.id}
     )
     budgets = result.scalars().all()
+    progress_by_budget = await calculate_budgets_progress(db, budgets, current_user.id)
+    # Budgets share a handful of periods, so compute each start once
+    period_starts = {period: get_period_start(period) for period in {budget.period for budget in budgets}}
     
-    response = []
+    budgets_response = []
     for budget in budgets:
-        current_amount, status = await calculate_budget_progress(db, budget, current_user.id)
-        progress = (current_amount / budget.amount * 100) if budget.amount > 0 else 0
-        
-        response.append(BudgetResponse(
-            id=str(budget.id),
-            name=budget.name,
-            type=budget.type.value if hasattr(budget.type, 'value') else str(budget.type),
-            category=budget.category,
-            amount=budget.amount,
-            period=budget.period.value if hasattr(budget.period, 'value') else str(budget.period),
-            current_amount=round(current_amount, 2),
-            progress_percent=round(progress, 1),
-            alert_at_percent=budget.alert_at_percent,
-            is_active=budget.is_active,
-            is_over_budget=progress >= 100 and budget.type == 'spending_limit',
-            status=status,
-            period_start=get_period_start(budget.period.value if hasattr(budget.period, 'value') else str(budget.period)).isoformat(),
-            created_at=budget.created_at.isoformat()
+        current_amount, budget_status = progress_by_budget[budget.id]
+        budgets_response.append(_budget_response(
+            budget, current_amount, budget_status, period_starts[budget.period]
         ))
     
-    return response
+    await response_cache.set(cache_key, budgets_response, ttl=60)
+    # Built from trusted rows, so skip response_model validation and serialize directly
+    return ORJSONResponse(budgets_response, headers={"ETag": etag})
 
 
 @router.post("", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
@@ -254,24 +372,7 @@ async def create_budget(
     await db.refresh(budget)
     
     current_amount, budget_status = await calculate_budget_progress(db, budget, current_user.id)
-    progress = (current_amount / budget.amount * 100) if budget.amount > 0 else 0
-    
-    return BudgetResponse(
-        id=str(budget.id),
-        name=budget.name,
-        type=budget.type,
-        category=budget.category,
-        amount=budget.amount,
-        period=budget.period,
-        current_amount=round(current_amount, 2),
-        progress_percent=round(progress, 1),
-        alert_at_percent=budget.alert_at_percent,
-        is_active=budget.is_active,
-        is_over_budget=progress >= 100 and budget.type == 'spending_limit',
-        status=budget_status,
-        period_start=budget.period_start.isoformat() if budget.period_start else None,
-        created_at=budget.created_at.isoformat()
-    )
+    return _budget_response(budget, current_amount, budget_status, budget.period_start)
 
 
 @router.put("/{budget_id}", response_model=BudgetResponse)
@@ -282,58 +383,31 @@ async def update_budget(
     current_user: User = Depends(get_current_user)
 ):
     """Update a budget."""
-    result = await db.execute(
-        select(Budget).where(
-            and_(
-                Budget.id == budget_id,
-                Budget.user_id == current_user.id
-            )
-        )
+    values = {field: value for field, value in budget_data.model_dump().items() if value is not None}
+    if budget_data.period is not None:
+        valid_periods = ['weekly', 'monthly', 'yearly']
+        if budget_data.period not in valid_periods:
+            raise HTTPException(status_code=400, detail="Invalid period")
+        values["period_start"] = get_period_start(budget_data.period)
+    
+    owned = and_(
+        Budget.id == budget_id,
+        Budget.user_id == current_user.id
     )
+    if values:
+        # Ownership check and update in one round trip
+        result = await db.execute(update(Budget).where(owned).values(**values).returning(Budget))
+    else:
+        result = await db.execute(select(Budget).where(owned))
     budget = result.scalar_one_or_none()
     
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
     
-    if budget_data.name is not None:
-        budget.name = budget_data.name
-    if budget_data.amount is not None:
-        budget.amount = budget_data.amount
-    if budget_data.category is not None:
-        budget.category = budget_data.category
-    if budget_data.period is not None:
-        valid_periods = ['weekly', 'monthly', 'yearly']
-        if budget_data.period not in valid_periods:
-            raise HTTPException(status_code=400, detail="Invalid period")
-        budget.period = budget_data.period
-        budget.period_start = get_period_start(budget_data.period)
-    if budget_data.alert_at_percent is not None:
-        budget.alert_at_percent = budget_data.alert_at_percent
-    if budget_data.is_active is not None:
-        budget.is_active = budget_data.is_active
-    
     await db.commit()
-    await db.refresh(budget)
     
     current_amount, budget_status = await calculate_budget_progress(db, budget, current_user.id)
-    progress = (current_amount / budget.amount * 100) if budget.amount > 0 else 0
-    
-    return BudgetResponse(
-        id=str(budget.id),
-        name=budget.name,
-        type=budget.type,
-        category=budget.category,
-        amount=budget.amount,
-        period=budget.period,
-        current_amount=round(current_amount, 2),
-        progress_percent=round(progress, 1),
-        alert_at_percent=budget.alert_at_percent,
-        is_active=budget.is_active,
-        is_over_budget=progress >= 100 and budget.type == 'spending_limit',
-        status=budget_status,
-        period_start=budget.period_start.isoformat() if budget.period_start else None,
-        created_at=budget.created_at.isoformat()
-    )
+    return _budget_response(budget, current_amount, budget_status, budget.period_start)
 
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -344,17 +418,15 @@ async def delete_budget(
 ):
     """Delete a budget."""
     result = await db.execute(
-        select(Budget).where(
+        delete(Budget).where(
             and_(
                 Budget.id == budget_id,
                 Budget.user_id == current_user.id
             )
         )
     )
-    budget = result.scalar_one_or_none()
     
-    if not budget:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Budget not found")
     
-    await db.delete(budget)
     await db.commit()
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from uuid import UUID
+from typing import List, Dict
 
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.models.user import User
 from app.models.contact import Contact
 from app.schemas.contact import ContactCreate, ContactUpdate, ContactResponse, ContactListResponse
@@ -11,6 +16,68 @@ from app.api.deps import get_current_user
 
 router = APIRouter(prefix="/contacts", tags=["Contacts"])
 
+# Statement skeletons built once; handlers only bind parameters
+# count(*) OVER () returns the total with the page in one round trip
+_LIST_CONTACTS = (
+    select(Contact, func.count().over().label("total"))
+    .where(Contact.user_id == bindparam("user_id"))
+    .order_by(Contact.name)
+    .offset(bindparam("skip", type_=Integer))
+    .limit(bindparam("limit", type_=Integer))
+)
+# The pattern is folded by the same lower() that computes name_ci
+_SEARCH_CONTACTS = _LIST_CONTACTS.where(Contact.name_ci.like(func.lower(bindparam("search", type_=String))))
+_COUNT_CONTACTS = select(func.count(Contact.id)).where(Contact.user_id == bindparam("user_id"))
+_COUNT_SEARCH_CONTACTS = _COUNT_CONTACTS.where(Contact.name_ci.like(func.lower(bindparam("search", type_=String))))
+# Names folded by Postgres' lower(), the same function behind name_ci; Python's
+# str.lower() differs for some letters (final sigma, dotted I)
+_CONTACT_NAMES = func.unnest(bindparam("names", type_=ARRAY(String))).table_valued("name").render_derived()
+_FOLD_CONTACT_NAMES = select(_CONTACT_NAMES.c.name, func.lower(_CONTACT_NAMES.c.name))
+
+
+def _contact_response(contact: Contact) -> dict:
+    """Build the ContactResponse payload for a contact."""
+    return {
+        "id": contact.id,
+        "user_id": contact.user_id,
+        "name": contact.name,
+        "phone": contact.phone,
+        "email": contact.email,
+        "note": contact.note,
+        "created_at": contact.created_at,
+        "updated_at": contact.updated_at,
+    }
+
+
+async def resolve_contact_ids(db: AsyncSession, user_id: UUID, names: List[str]) -> Dict[str, UUID]:
+    """Map contact names (case-insensitive) to contact ids, creating missing contacts.
+    
+    The result is keyed by the caller's own spellings.
+    """
+    if not names:
+        return {}
+    
+    # First spelling of each name wins when creating a contact
+    folded_result = await db.execute(_FOLD_CONTACT_NAMES, {"names": list(names)})
+    folded = dict(folded_result.all())
+    wanted = {}
+    for name in names:
+        wanted.setdefault(folded[name], name)
+    
+    # Upsert against the (user_id, name_ci) unique index; the no-op
+    # update makes existing rows come back through RETURNING too
+    stmt = pg_insert(Contact).values([
+        {"user_id": user_id, "name": name} for name in wanted.values()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Contact.user_id, Contact.name_ci],
+        set_={"name": Contact.name}
+    ).returning(Contact.name_ci, Contact.id)
+    
+    result = await db.execute(stmt)
+    ids_by_name_ci = dict(result.all())
+    return {name: ids_by_name_ci[folded[name]] for name in names}
+
 
 @router.get("", response_model=ContactListResponse)
 async def list_contacts(
@@ -20,24 +87,33 @@ async def list_contacts(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Contact).where(Contact.user_id == current_user.id)
+    version = await response_cache.user_version("contacts", current_user.id)
+    cache_key = f"contacts:{current_user.id}:{version}:{skip}:{limit}:{search or ''}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
     
+    params = {"user_id": current_user.id, "skip": skip, "limit": limit}
     if search:
-        query = query.where(Contact.name.ilike(f"%{search}%"))
-    
-    query = query.order_by(Contact.name).offset(skip).limit(limit)
+        params["search"] = f"%{search}%"
     
-    result = await db.execute(query)
-    contacts = result.scalars().all()
+    result = await db.execute(_SEARCH_CONTACTS if search else _LIST_CONTACTS, params)
+    rows = result.all()
+    contacts = [_contact_response(row.Contact) for row in rows]
     
-    # Get total count
-    count_query = select(func.count(Contact.id)).where(Contact.user_id == current_user.id)
-    if search:
-        count_query = count_query.where(Contact.name.ilike(f"%{search}%"))
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    # Get total count; a page past the end has no rows to carry it
+    if rows:
+        total = rows[0].total
+    elif skip:
+        count_result = await db.execute(_COUNT_SEARCH_CONTACTS if search else _COUNT_CONTACTS, params)
+        total = count_result.scalar()
+    else:
+        total = 0
     
-    return ContactListResponse(contacts=contacts, total=total)
+    response = {"contacts": contacts, "total": total}
+    await response_cache.set(cache_key, response, ttl=30)
+    # Built from trusted rows, so skip response_model validation and serialize directly
+    return ORJSONResponse(response)
 
 
 @router.post("", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
@@ -55,8 +131,16 @@ async def create_contact(
     )
     
     db.add(new_contact)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Contact with this name already exists"
+        )
     await db.refresh(new_contact)
+    await response_cache.invalidate("contacts", current_user.id)
     
     return new_contact
 
@@ -88,23 +172,28 @@ async def update_contact(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Contact).where(
-            Contact.id == contact_id,
-            Contact.user_id == current_user.id
-        )
-    )
-    contact = result.scalar_one_or_none()
-    
-    if not contact:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
-    
+    owned = [Contact.id == contact_id, Contact.user_id == current_user.id]
     update_data = contact_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(contact, field, value)
     
-    await db.commit()
-    await db.refresh(contact)
+    try:
+        if update_data:
+            # Ownership check and update in one round trip
+            result = await db.execute(update(Contact).where(*owned).values(**update_data).returning(Contact))
+        else:
+            result = await db.execute(select(Contact).where(*owned))
+        contact = result.scalar_one_or_none()
+        
+        if not contact:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+        
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Contact with this name already exists"
+        )
+    await response_cache.invalidate("contacts", current_user.id)
     
     return contact
 
@@ -128,3 +217,4 @@ async def delete_contact(
     
     await db.delete(contact)
     await db.commit()
+    await response_cache.invalidate("contacts", current_user.id)
@@ -3,6 +3,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
+from dataclasses import dataclass
+from cachetools import TTLCache
 
 from app.core.database import get_db
 from app.core.security import decode_access_token
@@ -11,10 +13,24 @@ from app.models.user import User
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+@dataclass(frozen=True)
+class UserClaims:
+    id: UUID
+    preferred_currency: str
+    preferred_language: str
+
+
+# Read-only user fields for hot endpoints, so they skip the users lookup.
+# Kept out of the JWT because preferences change while tokens live for days.
+_claims_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def invalidate_user_claims(user_id: UUID) -> None:
+    """Drop cached claims after the user's profile changes."""
+    _claims_cache.pop(user_id, None)
+
+
+def _get_token_user_id(credentials: HTTPAuthorizationCredentials) -> UUID:
     token = credentials.credentials
     payload = decode_access_token(token)
     
@@ -33,7 +49,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
+    return UUID(user_id)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    user_id = _get_token_user_id(credentials)
+    
+    result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
@@ -50,3 +75,44 @@ async def get_current_user(
         )
     
     return user
+
+
+async def get_current_user_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> UserClaims:
+    user_id = _get_token_user_id(credentials)
+    
+    claims = _claims_cache.get(user_id)
+    if claims is not None:
+        return claims
+    
+    result = await db.execute(
+        select(
+            User.is_active,
+            User.preferred_currency,
+            User.preferred_language
+        ).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if not row.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    
+    claims = UserClaims(
+        id=user_id,
+        preferred_currency=row.preferred_currency,
+        preferred_language=row.preferred_language
+    )
+    _claims_cache[user_id] = claims
+    return claims
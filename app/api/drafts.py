@@ -1,20 +1,136 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, func, case, bindparam, Integer
 from uuid import UUID
 from typing import List
+from datetime import datetime
 
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.models.user import User
 from app.models.draft import Draft, DraftStatus
 from app.models.transaction import Transaction, TransactionType, DebtStatus
-from app.models.contact import Contact
-from app.schemas.draft import DraftCreate, DraftUpdate, DraftResponse, DraftListResponse
+from app.schemas.draft import DraftCreate, DraftUpdate, DraftResponse, DraftListResponse, DraftBatchConfirm
 from app.schemas.transaction import TransactionResponse
 from app.api.deps import get_current_user
+from app.api.contacts import resolve_contact_ids
 
 router = APIRouter(prefix="/drafts", tags=["Drafts"])
 
+DEBT_TYPES = [
+    TransactionType.credit_receivable.value, TransactionType.credit_payable.value,
+    TransactionType.loan_receivable.value, TransactionType.loan_payable.value
+]
+PAYMENT_TYPES = [TransactionType.payment_received.value, TransactionType.payment_made.value]
+
+# Statement skeletons built once; handlers only bind parameters
+# count(*) OVER () returns the total with the page in one round trip
+_LIST_DRAFTS = (
+    select(Draft, func.count().over().label("total"))
+    .where(
+        Draft.user_id == bindparam("user_id"),
+        Draft.status == bindparam("status")
+    )
+    .order_by(Draft.created_at.desc())
+    .offset(bindparam("skip", type_=Integer))
+    .limit(bindparam("limit", type_=Integer))
+)
+_COUNT_DRAFTS = select(func.count(Draft.id)).where(
+    Draft.user_id == bindparam("user_id"),
+    Draft.status == bindparam("status")
+)
+
+
+def _draft_response(draft: Draft) -> dict:
+    """Build the DraftResponse payload for a draft."""
+    return {
+        "id": draft.id,
+        "user_id": draft.user_id,
+        "message_id": draft.message_id,
+        "date": draft.date,
+        "amount": draft.amount,
+        "description": draft.description,
+        "category": draft.category,
+        "type": draft.type,
+        "account": draft.account,
+        "contact_name": draft.contact_name,
+        "contact_id": draft.contact_id,
+        "due_date": draft.due_date,
+        "linked_transaction_id": draft.linked_transaction_id,
+        "status": draft.status,
+        "created_at": draft.created_at,
+        "updated_at": draft.updated_at,
+    }
+
+
+def _transaction_values(draft: Draft, contact_id) -> dict:
+    """Column values for the transaction a draft confirms into."""
+    values = {
+        "user_id": draft.user_id,
+        "amount": draft.amount,
+        "description": draft.description,
+        "category": draft.category,
+        "type": draft.type,
+        "account": draft.account,
+        "contact_name": draft.contact_name,
+        "contact_id": contact_id,
+        "due_date": draft.due_date,
+        "linked_transaction_id": draft.linked_transaction_id,
+        "status": None,
+        "remaining_amount": None,
+    }
+    
+    # Handle debt status
+    if draft.type in DEBT_TYPES:
+        values["status"] = DebtStatus.open
+        values["remaining_amount"] = draft.amount
+    
+    return values
+
+
+def _apply_payment_statement(user_id: UUID, debt_id: UUID, amount: float):
+    """Atomic UPDATE reducing a debt's remaining amount by a payment."""
+    new_remaining = func.greatest(
+        func.coalesce(Transaction.remaining_amount, Transaction.amount) - amount, 0
+    )
+    return (
+        update(Transaction)
+        .where(
+            Transaction.id == debt_id,
+            Transaction.user_id == user_id
+        )
+        .values(
+            remaining_amount=new_remaining,
+            status=case(
+                (new_remaining == 0, DebtStatus.settled.value),
+                else_=DebtStatus.partial.value
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+_GET_DRAFT = select(Draft).where(
+    Draft.id == bindparam("draft_id"),
+    Draft.user_id == bindparam("user_id")
+)
+_GET_DRAFT_FOR_UPDATE = _GET_DRAFT.with_for_update(of=Draft)
+
+
+async def _get_owned_draft(db: AsyncSession, draft_id: UUID, user_id: UUID, *, lock: bool = False) -> Draft:
+    """Fetch a draft owned by the user or raise 404; lock=True holds the row until commit."""
+    result = await db.execute(
+        _GET_DRAFT_FOR_UPDATE if lock else _GET_DRAFT,
+        {"draft_id": draft_id, "user_id": user_id}
+    )
+    draft = result.scalar_one_or_none()
+    
+    if not draft:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Draft not found")
+    
+    return draft
+
 
 @router.get("", response_model=DraftListResponse)
 async def list_drafts(
@@ -25,23 +141,23 @@ async def list_drafts(
     current_user: User = Depends(get_current_user)
 ):
     """List all drafts for the current user, filtered by status (default: pending)."""
-    query = select(Draft).where(
-        Draft.user_id == current_user.id,
-        Draft.status == status_filter
-    )
-    query = query.order_by(Draft.created_at.desc()).offset(skip).limit(limit)
-    
-    result = await db.execute(query)
-    drafts = result.scalars().all()
-    
-    count_query = select(func.count(Draft.id)).where(
-        Draft.user_id == current_user.id,
-        Draft.status == status_filter
-    )
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
-    
-    return DraftListResponse(drafts=drafts, total=total)
+    params = {"user_id": current_user.id, "status": status_filter, "skip": skip, "limit": limit}
+    
+    result = await db.execute(_LIST_DRAFTS, params)
+    rows = result.all()
+    drafts = [_draft_response(row.Draft) for row in rows]
+    
+    # A page past the end has no rows to carry the total
+    if rows:
+        total = rows[0].total
+    elif skip:
+        count_result = await db.execute(_COUNT_DRAFTS, params)
+        total = count_result.scalar()
+    else:
+        total = 0
+    
+    # Built from trusted rows, so skip response_model validation and serialize directly
+    return ORJSONResponse({"drafts": drafts, "total": total})
 
 
 @router.post("", response_model=DraftResponse, status_code=status.HTTP_201_CREATED)
@@ -51,7 +167,6 @@ async def create_draft(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new draft transaction."""
-    from datetime import datetime
     # Handle timezone-aware dates by converting to naive UTC
     draft_date = draft_data.date
     if draft_date and hasattr(draft_date, 'tzinfo') and draft_date.tzinfo is not None:
@@ -87,57 +202,114 @@ async def create_drafts_batch(
     current_user: User = Depends(get_current_user)
 ):
     """Create multiple drafts at once (used when AI generates multiple transactions)."""
-    from datetime import datetime
-    new_drafts = []
-    for draft_data in drafts_data:
-        # Handle timezone-aware dates by converting to naive UTC
-        draft_date = draft_data.date
-        if draft_date and hasattr(draft_date, 'tzinfo') and draft_date.tzinfo is not None:
-            draft_date = draft_date.replace(tzinfo=None)
-        
-        new_draft = Draft(
-            user_id=current_user.id,
-            message_id=draft_data.message_id,
-            date=draft_date or datetime.utcnow(),
-            amount=draft_data.amount,
-            description=draft_data.description,
-            category=draft_data.category,
-            type=draft_data.type,
-            account=draft_data.account,
-            contact_name=draft_data.contact_name,
-            contact_id=draft_data.contact_id,
-            due_date=draft_data.due_date,
-            linked_transaction_id=draft_data.linked_transaction_id,
-            status=DraftStatus.pending
-        )
-        db.add(new_draft)
-        new_drafts.append(new_draft)
-    
+    if not drafts_data:
+        return []
+    
+    # Dates arrive as naive UTC already (see DraftBase.parse_date_naive)
+    rows = [
+        {
+            **draft_data.model_dump(),
+            "user_id": current_user.id,
+            "date": draft_data.date or datetime.utcnow(),
+            "status": DraftStatus.pending
+        }
+        for draft_data in drafts_data
+    ]
+    
+    # One INSERT ... RETURNING brings back server defaults for every draft
+    result = await db.scalars(
+        insert(Draft).returning(Draft, sort_by_parameter_order=True),
+        rows
+    )
+    new_drafts = result.all()
     await db.commit()
-    for draft in new_drafts:
-        await db.refresh(draft)
     
     return new_drafts
 
 
-@router.get("/{draft_id}", response_model=DraftResponse)
-async def get_draft(
-    draft_id: UUID,
+@router.post("/batch/confirm", response_model=List[TransactionResponse])
+async def confirm_drafts_batch(
+    batch: DraftBatchConfirm,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get a specific draft by ID."""
+    """Confirm several drafts at once, creating all their transactions in one insert."""
+    draft_ids = list(dict.fromkeys(batch.draft_ids))
+    if not draft_ids:
+        return []
+    
+    # Locked so a concurrent confirm can't turn the same drafts into transactions twice
     result = await db.execute(
         select(Draft).where(
-            Draft.id == draft_id,
+            Draft.id.in_(draft_ids),
             Draft.user_id == current_user.id
-        )
+        ).with_for_update(of=Draft)
     )
-    draft = result.scalar_one_or_none()
+    drafts_by_id = {draft.id: draft for draft in result.scalars().all()}
     
-    if not draft:
+    if len(drafts_by_id) != len(draft_ids):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Draft not found")
     
+    drafts = [drafts_by_id[draft_id] for draft_id in draft_ids]
+    if any(draft.status != DraftStatus.pending for draft in drafts):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only pending drafts can be confirmed")
+    
+    # Handle contact linking
+    contact_names = [draft.contact_name for draft in drafts if draft.contact_name and not draft.contact_id]
+    contact_ids = await resolve_contact_ids(db, current_user.id, contact_names)
+    
+    # Handle payment linking with the same atomic statement as single confirms.
+    # Payments on one debt are summed first: clamping the running remainder at
+    # zero after each one ends at the same amount as clamping once after the total
+    payments_by_debt = {}
+    for draft in drafts:
+        if draft.type in PAYMENT_TYPES and draft.linked_transaction_id:
+            debt_id = draft.linked_transaction_id
+            payments_by_debt[debt_id] = payments_by_debt.get(debt_id, 0) + draft.amount
+    # A fixed order keeps concurrent confirms from locking the debts in opposite orders
+    for debt_id in sorted(payments_by_debt, key=str):
+        await db.execute(
+            _apply_payment_statement(current_user.id, debt_id, payments_by_debt[debt_id])
+        )
+    
+    rows = [
+        _transaction_values(
+            draft,
+            draft.contact_id or (contact_ids.get(draft.contact_name) if draft.contact_name else None)
+        )
+        for draft in drafts
+    ]
+    result = await db.scalars(
+        insert(Transaction).returning(Transaction, sort_by_parameter_order=True),
+        rows
+    )
+    new_txs = result.all()
+    
+    # Mark drafts as confirmed
+    await db.execute(
+        update(Draft)
+        .where(Draft.id.in_(draft_ids))
+        .values(status=DraftStatus.confirmed)
+        .execution_options(synchronize_session=False)
+    )
+    
+    await db.commit()
+    if contact_names:
+        # Names may have created contacts
+        await response_cache.invalidate("contacts", current_user.id)
+    
+    return new_txs
+
+
+@router.get("/{draft_id}", response_model=DraftResponse)
+async def get_draft(
+    draft_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a specific draft by ID."""
+    draft = await _get_owned_draft(db, draft_id, current_user.id)
+    
     return draft
 
 
@@ -149,16 +321,7 @@ async def update_draft(
     current_user: User = Depends(get_current_user)
 ):
     """Update a draft (only pending drafts can be updated)."""
-    result = await db.execute(
-        select(Draft).where(
-            Draft.id == draft_id,
-            Draft.user_id == current_user.id
-        )
-    )
-    draft = result.scalar_one_or_none()
-    
-    if not draft:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Draft not found")
+    draft = await _get_owned_draft(db, draft_id, current_user.id, lock=True)
     
     if draft.status != DraftStatus.pending:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only pending drafts can be updated")
@@ -180,16 +343,7 @@ async def confirm_draft(
     current_user: User = Depends(get_current_user)
 ):
     """Confirm a draft and create the actual transaction."""
-    result = await db.execute(
-        select(Draft).where(
-            Draft.id == draft_id,
-            Draft.user_id == current_user.id
-        )
-    )
-    draft = result.scalar_one_or_none()
-    
-    if not draft:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Draft not found")
+    draft = await _get_owned_draft(db, draft_id, current_user.id, lock=True)
     
     if draft.status != DraftStatus.pending:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only pending drafts can be confirmed")
@@ -197,58 +351,17 @@ async def confirm_draft(
     # Handle contact linking
     contact_id = draft.contact_id
     if draft.contact_name and not contact_id:
-        result = await db.execute(
-            select(Contact).where(
-                Contact.user_id == current_user.id,
-                func.lower(Contact.name) == draft.contact_name.lower()
-            )
-        )
-        existing_contact = result.scalar_one_or_none()
-        if existing_contact:
-            contact_id = existing_contact.id
-        else:
-            new_contact = Contact(user_id=current_user.id, name=draft.contact_name)
-            db.add(new_contact)
-            await db.flush()
-            contact_id = new_contact.id
+        contact_ids = await resolve_contact_ids(db, current_user.id, [draft.contact_name])
+        contact_id = contact_ids[draft.contact_name]
     
     # Create the transaction
-    new_tx = Transaction(
-        user_id=current_user.id,
-        amount=draft.amount,
-        description=draft.description,
-        category=draft.category,
-        type=draft.type,
-        account=draft.account,
-        contact_name=draft.contact_name,
-        contact_id=contact_id,
-        due_date=draft.due_date,
-        linked_transaction_id=draft.linked_transaction_id
-    )
+    new_tx = Transaction(**_transaction_values(draft, contact_id))
     
-    # Handle debt status
-    if draft.type in [TransactionType.credit_receivable.value, TransactionType.credit_payable.value,
-                      TransactionType.loan_receivable.value, TransactionType.loan_payable.value]:
-        new_tx.status = DebtStatus.open
-        new_tx.remaining_amount = draft.amount
-    
-    # Handle payment linking
-    if draft.type in [TransactionType.payment_received.value, TransactionType.payment_made.value]:
-        if draft.linked_transaction_id:
-            linked_result = await db.execute(
-                select(Transaction).where(
-                    Transaction.id == draft.linked_transaction_id,
-                    Transaction.user_id == current_user.id
-                )
-            )
-            linked_tx = linked_result.scalar_one_or_none()
-            
-            if linked_tx:
-                current_remaining = linked_tx.remaining_amount if linked_tx.remaining_amount is not None else linked_tx.amount
-                apply_amount = min(draft.amount, current_remaining)
-                new_remaining = current_remaining - apply_amount
-                linked_tx.remaining_amount = new_remaining
-                linked_tx.status = DebtStatus.settled if new_remaining == 0 else DebtStatus.partial
+    # Handle payment linking in one statement, so concurrent payments can't lose updates
+    if draft.type in PAYMENT_TYPES and draft.linked_transaction_id:
+        await db.execute(
+            _apply_payment_statement(current_user.id, draft.linked_transaction_id, draft.amount)
+        )
     
     db.add(new_tx)
     
@@ -257,6 +370,9 @@ async def confirm_draft(
     
     await db.commit()
     await db.refresh(new_tx)
+    if draft.contact_name and not draft.contact_id:
+        # The name may have created a contact
+        await response_cache.invalidate("contacts", current_user.id)
     
     return new_tx
 
@@ -268,16 +384,7 @@ async def discard_draft(
     current_user: User = Depends(get_current_user)
 ):
     """Discard a draft (mark as discarded, not deleted for history)."""
-    result = await db.execute(
-        select(Draft).where(
-            Draft.id == draft_id,
-            Draft.user_id == current_user.id
-        )
-    )
-    draft = result.scalar_one_or_none()
-    
-    if not draft:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Draft not found")
+    draft = await _get_owned_draft(db, draft_id, current_user.id, lock=True)
     
     if draft.status != DraftStatus.pending:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only pending drafts can be discarded")
@@ -297,16 +404,7 @@ async def delete_draft(
     current_user: User = Depends(get_current_user)
 ):
     """Permanently delete a draft."""
-    result = await db.execute(
-        select(Draft).where(
-            Draft.id == draft_id,
-            Draft.user_id == current_user.id
-        )
-    )
-    draft = result.scalar_one_or_none()
-    
-    if not draft:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Draft not found")
+    draft = await _get_owned_draft(db, draft_id, current_user.id)
     
     await db.delete(draft)
     await db.commit()
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, bindparam, literal_column, type_coerce, String, and_, or_
 from pydantic import BaseModel
-from typing import Optional
+from typing import AsyncIterator, Optional, List, Dict, Any
+from uuid import UUID
 
-from app.core.database import get_db
-from app.models.user import User
-from app.models.transaction import Transaction
+from app.core.database import get_db, async_session_maker
+from app.core.cache import response_cache
+from app.core.etag import make_etag, etag_day, etag_matches
+from app.models.transaction import Transaction, TransactionType, DebtStatus
 from app.models.contact import Contact
-from app.api.deps import get_current_user
-from app.services.insights_service import generate_weekly_summary, answer_financial_question, calculate_health_score, generate_health_tips, calculate_spending_comparisons, calculate_smart_predictions, generate_proactive_nudges
+from app.api.deps import UserClaims, get_current_user_claims
+from app.services.insights_service import generate_weekly_summary, stream_weekly_summary, answer_financial_question, stream_financial_answer, calculate_health_score, generate_health_tips, generate_summary_and_tips, calculate_spending_comparisons, calculate_smart_predictions, generate_proactive_nudges
 from app.models.budget import Budget
+from app.api.budgets import calculate_budgets_progress, get_budgets_etag
 
 router = APIRouter(prefix="/insights", tags=["Insights"])
 
@@ -154,99 +161,400 @@ class ProactiveNudgesResponse(BaseModel):
     generated_at: str
 
 
-@router.get("/weekly-summary", response_model=WeeklySummaryResponse)
-async def get_weekly_summary(
-    currency_symbol: str = "$",
-    language_code: str = "en",
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Generate AI-powered weekly financial summary."""
-    
-    # Fetch user's transactions
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .order_by(Transaction.date.desc())
+class AllInsightsResponse(BaseModel):
+    weekly_summary: WeeklySummaryResponse
+    health_score: HealthScoreResponse
+    spending_comparisons: SpendingComparisonsResponse
+    smart_predictions: SmartPredictionsResponse
+    nudges: ProactiveNudgesResponse
+
+
+# Only the columns the insight services read; rows skip the ORM identity map.
+# The enum columns are varchar, so reading them as String yields plain strings
+_TRANSACTION_DATA = (
+    select(
+        Transaction.id, Transaction.date, Transaction.amount, Transaction.description,
+        Transaction.category,
+        type_coerce(Transaction.type, String).label("type"),
+        type_coerce(Transaction.account, String).label("account"),
+        Transaction.contact_name,
+        type_coerce(Transaction.status, String).label("status"),
+        Transaction.remaining_amount, Transaction.due_date
+    )
+    .where(Transaction.user_id == bindparam("user_id"))
+    .order_by(Transaction.date.desc())
+    .execution_options(yield_per=500)
+)
+# Windowed variant: recent rows plus open debts, whose balances the services total over all history
+_RECENT_TRANSACTION_DATA = _TRANSACTION_DATA.where(or_(
+    Transaction.date >= bindparam("since"),
+    and_(
+        Transaction.type.in_([
+            TransactionType.credit_receivable, TransactionType.credit_payable,
+            TransactionType.loan_receivable, TransactionType.loan_payable
+        ]),
+        Transaction.status.is_distinct_from(DebtStatus.settled)
     )
-    transactions = result.scalars().all()
+))
+# Counts catch deletes and max(updated_at) catches inserts and edits
+_TRANSACTIONS_FINGERPRINT = select(
+    func.count(Transaction.id), func.max(Transaction.updated_at)
+).where(Transaction.user_id == bindparam("user_id"))
+
+
+# Inline literals, so the grouped expression matches the selected one exactly
+_MONTH_CATEGORY = func.lower(func.coalesce(
+    func.nullif(Transaction.category, literal_column("''")), literal_column("'other'")
+))
+_MONTH_TOTALS = (
+    select(Transaction.type, _MONTH_CATEGORY.label("category"), func.sum(Transaction.amount).label("total"))
+    .where(
+        Transaction.user_id == bindparam("user_id"),
+        Transaction.type.in_([TransactionType.income, TransactionType.expense]),
+        Transaction.date >= bindparam("since")
+    )
+    .group_by(Transaction.type, _MONTH_CATEGORY)
+)
+
+
+_PAYABLE_TYPES = [TransactionType.credit_payable, TransactionType.loan_payable]
+_RECEIVABLE_TYPES = [TransactionType.credit_receivable, TransactionType.loan_receivable]
+_OPEN_DEBT_AMOUNT = func.coalesce(Transaction.remaining_amount, Transaction.amount)
+# Health-score totals in one row: last month's income and expenses plus open debts over all history
+_HEALTH_TOTALS = select(
+    func.coalesce(func.sum(Transaction.amount).filter(
+        Transaction.type == TransactionType.income, Transaction.date >= bindparam("since")
+    ), 0.0).label("month_income"),
+    func.coalesce(func.sum(Transaction.amount).filter(
+        Transaction.type == TransactionType.expense, Transaction.date >= bindparam("since")
+    ), 0.0).label("month_expense"),
+    func.coalesce(func.sum(_OPEN_DEBT_AMOUNT).filter(
+        Transaction.type.in_(_RECEIVABLE_TYPES), Transaction.status.is_distinct_from(DebtStatus.settled)
+    ), 0.0).label("total_receivable"),
+    func.coalesce(func.sum(_OPEN_DEBT_AMOUNT).filter(
+        Transaction.type.in_(_PAYABLE_TYPES), Transaction.status.is_distinct_from(DebtStatus.settled)
+    ), 0.0).label("total_payable")
+).where(Transaction.user_id == bindparam("user_id"))
+# ISO week numbers, as the spending-consistency factor has always bucketed them
+_EXPENSE_WEEK = func.extract("week", Transaction.date)
+_WEEKLY_EXPENSES = (
+    select(func.sum(Transaction.amount))
+    .where(
+        Transaction.user_id == bindparam("user_id"),
+        Transaction.type == TransactionType.expense,
+        Transaction.date >= bindparam("since")
+    )
+    .group_by(_EXPENSE_WEEK)
+)
+
+
+_CONTACT_DATA = select(Contact.id, Contact.name, Contact.phone, Contact.email).where(
+    Contact.user_id == bindparam("user_id")
+)
+# Rows carry every attribute the progress helpers read, without ORM instances
+_ACTIVE_BUDGETS = select(
+    Budget.id,
+    Budget.name,
+    Budget.type,
+    Budget.category,
+    Budget.amount,
+    Budget.period,
+    Budget.alert_at_percent,
+    Budget.is_active
+).where(Budget.user_id == bindparam("user_id"), Budget.is_active)
+
+
+async def _transactions_fingerprint(db: AsyncSession, user_id: UUID) -> str:
+    """Fingerprint that changes whenever any of a user's transactions does."""
+    result = await db.execute(_TRANSACTIONS_FINGERPRINT, {"user_id": user_id})
+    count, last_updated = result.one()
+    return f"{count}:{last_updated}"
+
+
+_DEBT_TYPES = {
+    TransactionType.credit_receivable.value, TransactionType.credit_payable.value,
+    TransactionType.loan_receivable.value, TransactionType.loan_payable.value
+}
+
+
+def _within_window(tx_data: List[Dict[str, Any]], days: int) -> List[Dict[str, Any]]:
+    """Narrow loaded rows to what a load with a smaller days window returns."""
+    # Mirrors _RECENT_TRANSACTION_DATA: recent rows plus open debts, order kept
+    since = datetime.utcnow() - timedelta(days=days)
+    return [
+        tx for tx in tx_data
+        if (tx["date"] is not None and tx["date"] >= since)
+        or (tx["type"] in _DEBT_TYPES and tx["status"] != DebtStatus.settled.value)
+    ]
+
+
+def _restore_tx_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a cached row's JSON strings back into the datetimes and UUID a fresh load yields."""
+    # Redis round-trips rows through JSON; the in-process cache keeps them native
+    if not isinstance(row["id"], str):
+        return row
+    return {
+        **row,
+        "id": UUID(row["id"]),
+        "date": datetime.fromisoformat(row["date"]) if row["date"] else None,
+        "due_date": datetime.fromisoformat(row["due_date"]) if row["due_date"] else None,
+    }
+
+
+async def load_transaction_data(
+    db: AsyncSession,
+    user_id: UUID,
+    fingerprint: Optional[str] = None,
+    days: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Fetch a user's transactions, newest first, as dicts for the insight services.
+
+    With days set, only that many days of history are loaded, plus any
+    open debts. Dates and ids are native on every cache backend; orjson
+    encodes them if they reach a response. The list is shared through the
+    response cache until the user's transactions change, so callers must
+    not mutate it.
+    """
+    if fingerprint is None:
+        fingerprint = await _transactions_fingerprint(db, user_id)
+    cache_key = f"insight_tx:{user_id}:{fingerprint}:{days or 'all'}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return [_restore_tx_row(row) for row in cached]
     
-    # Convert to dict format for the AI service
-    tx_data = [
+    # Stream through a server-side cursor so the full row set and the dicts never coexist
+    if days is None:
+        result = await db.stream(_TRANSACTION_DATA, {"user_id": user_id})
+    else:
+        since = datetime.utcnow() - timedelta(days=days)
+        result = await db.stream(_RECENT_TRANSACTION_DATA, {"user_id": user_id, "since": since})
+    tx_data = [dict(row) async for row in result.mappings()]
+    await response_cache.set(cache_key, tx_data, ttl=10 * 60)
+    return tx_data
+
+
+async def get_transactions_fingerprint(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserClaims = Depends(get_current_user_claims)
+) -> str:
+    """Current user's transaction fingerprint; FastAPI runs this once per request."""
+    return await _transactions_fingerprint(db, current_user.id)
+
+
+async def get_insights_etag(
+    request: Request,
+    fingerprint: str = Depends(get_transactions_fingerprint),
+    current_user: UserClaims = Depends(get_current_user_claims)
+) -> str:
+    """ETag of a GET insight; answers 304 before any transactions are loaded."""
+    # Query params carry currency and language, and the date rolls the tag over daily
+    etag = make_etag(current_user.id, fingerprint, request.url.path, request.url.query, etag_day())
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return etag
+
+
+def _insights_headers(etag: str) -> Dict[str, str]:
+    """Caching headers for a GET insight; clients must revalidate before reuse."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+# The services look back at most 30 days (90 for predictions); the
+# margin covers their local-time windows against UTC timestamps
+MONTH_WINDOW_DAYS = 35
+QUARTER_WINDOW_DAYS = 95
+# Keys embed the data fingerprint, so entries only ever age out
+INSIGHTS_CACHE_TTL = 5 * 60
+
+
+async def _load_contact_data(db: AsyncSession, user_id: UUID) -> List[Dict[str, Any]]:
+    """Fetch a user's contacts as dicts for the insight services."""
+    result = await db.execute(_CONTACT_DATA, {"user_id": user_id})
+    return [
         {
-            "id": str(tx.id),
-            "date": tx.date.isoformat() if tx.date else None,
-            "amount": tx.amount,
-            "description": tx.description,
-            "category": tx.category,
-            "type": tx.type.value if tx.type else None,
-            "account": tx.account.value if tx.account else None,
-            "contact_name": tx.contact_name,
-            "status": tx.status.value if tx.status else None,
-            "remaining_amount": tx.remaining_amount
+            "id": row.id,
+            "name": row.name,
+            "phone": row.phone,
+            "email": row.email
         }
-        for tx in transactions
+        for row in result
     ]
+
+
+async def _sse(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Frame text chunks as server-sent events, ending with a done event."""
+    async for chunk in chunks:
+        # Every line of a chunk needs its own data field; clients join them with newlines
+        yield "".join(f"data: {line}\n" for line in chunk.split("\n")) + "\n"
+    yield "event: done\ndata: \n\n"
+
+
+def _sse_response(chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Stream text chunks to the client as they arrive."""
+    return StreamingResponse(
+        _sse(chunks),
+        media_type="text/event-stream",
+        # Proxies must pass events through instead of buffering the body
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _load_budget_data(db: AsyncSession, user_id: UUID) -> List[Dict[str, Any]]:
+    """Fetch a user's active budgets with progress as dicts for the nudges service."""
+    # Inactive budgets never produce nudges
+    budget_result = await db.execute(_ACTIVE_BUDGETS, {"user_id": user_id})
+    budgets = budget_result.all()
+    # Every budget's progress from one aggregate query
+    progress_by_budget = await calculate_budgets_progress(db, budgets, user_id)
     
+    budget_data = []
+    for budget in budgets:
+        current_amount, _ = progress_by_budget[budget.id]
+        progress = (current_amount / budget.amount * 100) if budget.amount > 0 else 0
+        
+        budget_data.append({
+            "id": str(budget.id),
+            "name": budget.name,
+            "type": budget.type,
+            "category": budget.category,
+            "amount": budget.amount,
+            "current_amount": current_amount,
+            "progress_percent": progress,
+            "alert_at_percent": budget.alert_at_percent,
+            "is_active": budget.is_active,
+        })
+    return budget_data
+
+
+async def _weekly_summary_payload(
+    tx_data: List[Dict[str, Any]],
+    currency_symbol: str,
+    language_code: str
+) -> Dict[str, Any]:
+    """Build the WeeklySummaryResponse payload."""
     summary = await generate_weekly_summary(
         transactions=tx_data,
         currency_symbol=currency_symbol,
         language_code=language_code
     )
+    return {"summary": summary}
+
+
+async def _load_health_totals(db: AsyncSession, user_id: UUID) -> Dict[str, Any]:
+    """Aggregate the health-score inputs for a user in the database."""
+    params = {"user_id": user_id, "since": datetime.now() - timedelta(days=30)}
+    totals = (await db.execute(_HEALTH_TOTALS, params)).one()
+    weekly_expenses = (await db.execute(_WEEKLY_EXPENSES, params)).scalars().all()
+    return {**totals._asdict(), "weekly_expenses": list(weekly_expenses)}
+
+
+async def _health_score_payload(
+    health_totals: Dict[str, Any],
+    currency_symbol: str,
+    language_code: str
+) -> Dict[str, Any]:
+    """Build the HealthScoreResponse payload."""
+    health_data = calculate_health_score(**health_totals, currency_symbol=currency_symbol)
+    
+    # Generate AI tips
+    tips = await generate_health_tips(health_data, currency_symbol, language_code)
+    
+    return {**health_data, "tips": tips}
+
+
+async def _spending_comparisons_payload(db: AsyncSession, user_id: UUID, currency_symbol: str) -> Dict[str, Any]:
+    """Build the SpendingComparisonsResponse payload."""
+    # Last month's totals come back as one row per (type, category)
+    result = await db.execute(_MONTH_TOTALS, {
+        "user_id": user_id,
+        "since": datetime.now() - timedelta(days=30)
+    })
+    monthly_income = 0
+    monthly_expenses = 0
+    category_spending: Dict[str, float] = {}
+    for row in result:
+        if row.type == TransactionType.income:
+            monthly_income += row.total
+        else:
+            monthly_expenses += row.total
+            category_spending[row.category] = row.total
+    
+    return calculate_spending_comparisons(
+        monthly_income, monthly_expenses, category_spending, currency_symbol
+    )
+
+
+async def _smart_predictions_payload(tx_data: List[Dict[str, Any]], currency_symbol: str) -> Dict[str, Any]:
+    """Build the SmartPredictionsResponse payload."""
+    return await asyncio.to_thread(calculate_smart_predictions, tx_data, currency_symbol)
+
+
+async def _nudges_payload(
+    tx_data: List[Dict[str, Any]],
+    budget_data: List[Dict[str, Any]],
+    currency_symbol: str
+) -> Dict[str, Any]:
+    """Build the ProactiveNudgesResponse payload."""
+    nudges_data = await asyncio.to_thread(generate_proactive_nudges, tx_data, budget_data, currency_symbol)
+    
+    # Nudges leave optional fields out, so let the model fill them in
+    return ProactiveNudgesResponse(
+        nudges=nudges_data["nudges"],
+        summary=nudges_data["summary"],
+        generated_at=nudges_data["generated_at"]
+    ).model_dump(mode="json")
+
+
+@router.get("/weekly-summary", response_model=WeeklySummaryResponse)
+async def get_weekly_summary(
+    currency_symbol: str = "$",
+    language_code: str = "en",
+    etag: str = Depends(get_insights_etag),
+    fingerprint: str = Depends(get_transactions_fingerprint),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserClaims = Depends(get_current_user_claims)
+):
+    """Generate AI-powered weekly financial summary."""
+    # The etag covers the user, their data, the query and the day
+    cache_key = f"insights:{etag}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers=_insights_headers(etag))
+    
+    tx_data = await load_transaction_data(db, current_user.id, fingerprint, days=MONTH_WINDOW_DAYS)
+    response = await _weekly_summary_payload(tx_data, currency_symbol, language_code)
     
-    return WeeklySummaryResponse(summary=summary)
+    await response_cache.set(cache_key, response, ttl=INSIGHTS_CACHE_TTL)
+    return ORJSONResponse(response, headers=_insights_headers(etag))
+
+
+@router.get("/weekly-summary/stream")
+async def stream_weekly_summary_events(
+    currency_symbol: str = "$",
+    language_code: str = "en",
+    fingerprint: str = Depends(get_transactions_fingerprint),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserClaims = Depends(get_current_user_claims)
+):
+    """Stream the weekly summary as server-sent events while it's generated."""
+    # The transactions are read before the stream starts, while the request session is open
+    tx_data = await load_transaction_data(db, current_user.id, fingerprint, days=MONTH_WINDOW_DAYS)
+    return _sse_response(stream_weekly_summary(tx_data, currency_symbol, language_code))
 
 
 @router.post("/ask", response_model=QuestionResponse)
 async def ask_question(
     request: QuestionRequest,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_user_claims)
 ):
     """Ask AI a question about your financial data."""
     
-    # Fetch user's transactions
-    tx_result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .order_by(Transaction.date.desc())
-    )
-    transactions = tx_result.scalars().all()
-    
-    # Fetch user's contacts
-    contact_result = await db.execute(
-        select(Contact)
-        .where(Contact.user_id == current_user.id)
-    )
-    contacts = contact_result.scalars().all()
-    
-    # Convert to dict format
-    tx_data = [
-        {
-            "id": str(tx.id),
-            "date": tx.date.isoformat() if tx.date else None,
-            "amount": tx.amount,
-            "description": tx.description,
-            "category": tx.category,
-            "type": tx.type.value if tx.type else None,
-            "account": tx.account.value if tx.account else None,
-            "contact_name": tx.contact_name,
-            "status": tx.status.value if tx.status else None,
-            "remaining_amount": tx.remaining_amount,
-            "due_date": tx.due_date.isoformat() if tx.due_date else None
-        }
-        for tx in transactions
-    ]
-    
-    contact_data = [
-        {
-            "id": str(c.id),
-            "name": c.name,
-            "phone": c.phone,
-            "email": c.email
-        }
-        for c in contacts
-    ]
+    # A session runs one statement at a time, so give each query its own to overlap them
+    async with async_session_maker() as tx_session, async_session_maker() as contact_session:
+        tx_data, contact_data = await asyncio.gather(
+            load_transaction_data(tx_session, current_user.id),
+            _load_contact_data(contact_session, current_user.id)
+        )
     
     answer = await answer_financial_question(
         question=request.question,
@@ -259,102 +567,76 @@ async def ask_question(
     return QuestionResponse(answer=answer)
 
 
+@router.post("/ask/stream")
+async def ask_question_stream(
+    request: QuestionRequest,
+    current_user: UserClaims = Depends(get_current_user_claims)
+):
+    """Stream the answer to a financial question as server-sent events."""
+    async with async_session_maker() as tx_session, async_session_maker() as contact_session:
+        tx_data, contact_data = await asyncio.gather(
+            load_transaction_data(tx_session, current_user.id),
+            _load_contact_data(contact_session, current_user.id)
+        )
+    
+    return _sse_response(stream_financial_answer(
+        question=request.question,
+        transactions=tx_data,
+        contacts=contact_data,
+        currency_symbol=request.currency_symbol,
+        language_code=request.language_code
+    ))
+
+
 @router.get("/health-score", response_model=HealthScoreResponse)
 async def get_health_score(
     currency_symbol: str = "$",
     language_code: str = "en",
+    etag: str = Depends(get_insights_etag),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_user_claims)
 ):
     """Calculate financial health score with AI-powered improvement tips."""
+    cache_key = f"insights:{etag}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers=_insights_headers(etag))
     
-    # Fetch user's transactions
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .order_by(Transaction.date.desc())
-    )
-    transactions = result.scalars().all()
-    
-    # Convert to dict format
-    tx_data = [
-        {
-            "id": str(tx.id),
-            "date": tx.date.isoformat() if tx.date else None,
-            "amount": tx.amount,
-            "description": tx.description,
-            "category": tx.category,
-            "type": tx.type.value if tx.type else None,
-            "account": tx.account.value if tx.account else None,
-            "contact_name": tx.contact_name,
-            "status": tx.status.value if tx.status else None,
-            "remaining_amount": tx.remaining_amount
-        }
-        for tx in transactions
-    ]
-    
-    # Calculate health score
-    health_data = calculate_health_score(tx_data, currency_symbol)
+    health_totals = await _load_health_totals(db, current_user.id)
+    response = await _health_score_payload(health_totals, currency_symbol, language_code)
     
-    # Generate AI tips
-    tips = await generate_health_tips(health_data, currency_symbol, language_code)
-    
-    return HealthScoreResponse(
-        score=health_data["score"],
-        grade=health_data["grade"],
-        grade_color=health_data["grade_color"],
-        breakdown=health_data["breakdown"],
-        summary=health_data["summary"],
-        tips=tips
-    )
+    # The service builds the full response shape, so skip a second validation pass
+    await response_cache.set(cache_key, response, ttl=INSIGHTS_CACHE_TTL)
+    return ORJSONResponse(response, headers=_insights_headers(etag))
 
 
 @router.get("/spending-comparisons", response_model=SpendingComparisonsResponse)
 async def get_spending_comparisons(
     currency_symbol: str = "$",
+    etag: str = Depends(get_insights_etag),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_user_claims)
 ):
     """Compare user's spending to anonymous benchmarks."""
+    cache_key = f"insights:{etag}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers=_insights_headers(etag))
     
-    # Fetch user's transactions
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .order_by(Transaction.date.desc())
-    )
-    transactions = result.scalars().all()
+    response = await _spending_comparisons_payload(db, current_user.id, currency_symbol)
     
-    # Convert to dict format
-    tx_data = [
-        {
-            "id": str(tx.id),
-            "date": tx.date.isoformat() if tx.date else None,
-            "amount": tx.amount,
-            "description": tx.description,
-            "category": tx.category,
-            "type": tx.type.value if tx.type else None,
-        }
-        for tx in transactions
-    ]
-    
-    # Calculate comparisons
-    comparisons_data = calculate_spending_comparisons(tx_data, currency_symbol)
-    
-    return SpendingComparisonsResponse(
-        monthly_income=comparisons_data["monthly_income"],
-        monthly_expenses=comparisons_data["monthly_expenses"],
-        comparisons=comparisons_data["comparisons"],
-        percentile=comparisons_data["percentile"],
-        summary=comparisons_data["summary"]
-    )
+    # The service builds the full response shape, so skip a second validation pass
+    await response_cache.set(cache_key, response, ttl=INSIGHTS_CACHE_TTL)
+    return ORJSONResponse(response, headers=_insights_headers(etag))
 
 
 @router.get("/smart-predictions", response_model=SmartPredictionsResponse)
 async def get_smart_predictions(
     currency_symbol: str = "$",
+    etag: str = Depends(get_insights_etag),
+    fingerprint: str = Depends(get_transactions_fingerprint),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_user_claims)
 ):
     """
     Get smart predictions including:
@@ -362,48 +644,25 @@ async def get_smart_predictions(
     - Bill reminders based on recurring patterns
     - Debt payoff timeline
     """
+    cache_key = f"insights:{etag}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers=_insights_headers(etag))
     
-    # Fetch all user transactions
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .order_by(Transaction.date.desc())
-    )
-    transactions = result.scalars().all()
-    
-    # Convert to dict format
-    tx_data = [
-        {
-            "id": str(tx.id),
-            "date": tx.date.isoformat() if tx.date else None,
-            "amount": tx.amount,
-            "description": tx.description,
-            "category": tx.category,
-            "type": tx.type.value if tx.type else None,
-            "contact_name": tx.contact_name,
-            "remaining_amount": tx.remaining_amount,
-            "status": tx.status.value if tx.status else None,
-            "due_date": tx.due_date.isoformat() if tx.due_date else None,
-        }
-        for tx in transactions
-    ]
+    tx_data = await load_transaction_data(db, current_user.id, fingerprint, days=QUARTER_WINDOW_DAYS)
+    response = await _smart_predictions_payload(tx_data, currency_symbol)
     
-    # Calculate predictions
-    predictions = calculate_smart_predictions(tx_data, currency_symbol)
-    
-    return SmartPredictionsResponse(
-        cash_flow_forecast=predictions["cash_flow_forecast"],
-        bill_reminders=predictions["bill_reminders"],
-        debt_payoff=predictions["debt_payoff"],
-        generated_at=predictions["generated_at"]
-    )
+    # The service builds the full response shape, so skip a second validation pass
+    await response_cache.set(cache_key, response, ttl=INSIGHTS_CACHE_TTL)
+    return ORJSONResponse(response, headers=_insights_headers(etag))
 
 
 @router.get("/nudges", response_model=ProactiveNudgesResponse)
 async def get_proactive_nudges(
     currency_symbol: str = "$",
+    fingerprint: str = Depends(get_transactions_fingerprint),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_user_claims)
 ):
     """
     Get proactive AI nudges including:
@@ -411,60 +670,79 @@ async def get_proactive_nudges(
     - Smart alerts for budget warnings and unusual spending
     - Celebrations for achievements and milestones
     """
-    from app.api.budgets import calculate_budget_progress, get_period_start
-    from app.models.budget import BudgetType
+    # Nudges read budgets too, so key on the user and the budget list's
+    # fingerprint, which covers transactions, budgets and the day
+    budgets_etag = await get_budgets_etag(db, current_user.id)
+    cache_key = f"insights:nudges:{current_user.id}:{budgets_etag}:{currency_symbol}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
     
-    # Fetch all user transactions
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .order_by(Transaction.date.desc())
-    )
-    transactions = result.scalars().all()
+    # Budgets load on a second session so both queries run at once
+    async with async_session_maker() as budget_session:
+        tx_data, budget_data = await asyncio.gather(
+            load_transaction_data(db, current_user.id, fingerprint, days=MONTH_WINDOW_DAYS),
+            _load_budget_data(budget_session, current_user.id)
+        )
+    response = await _nudges_payload(tx_data, budget_data, currency_symbol)
     
-    # Convert to dict format
-    tx_data = [
-        {
-            "id": str(tx.id),
-            "date": tx.date.isoformat() if tx.date else None,
-            "amount": tx.amount,
-            "description": tx.description,
-            "category": tx.category,
-            "type": tx.type.value if tx.type else None,
-            "contact_name": tx.contact_name,
-        }
-        for tx in transactions
-    ]
-    
-    # Fetch user budgets with progress
-    budget_result = await db.execute(
-        select(Budget)
-        .where(Budget.user_id == current_user.id)
-    )
-    budgets = budget_result.scalars().all()
+    await response_cache.set(cache_key, response, ttl=INSIGHTS_CACHE_TTL)
+    return ORJSONResponse(response)
+
+
+@router.get("/all", response_model=AllInsightsResponse)
+async def get_all_insights(
+    request: Request,
+    currency_symbol: str = "$",
+    language_code: str = "en",
+    fingerprint: str = Depends(get_transactions_fingerprint),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserClaims = Depends(get_current_user_claims)
+):
+    """Get every dashboard insight in one request, computing them concurrently."""
+    # Budgets feed the nudges, so tag on the budget list's fingerprint plus the query.
+    # The fingerprint isn't user-scoped, so the user id keeps accounts apart in the shared cache
+    budgets_etag = await get_budgets_etag(db, current_user.id)
+    etag = make_etag(current_user.id, budgets_etag, request.url.path, request.url.query)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    cache_key = f"insights:{etag}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers=_insights_headers(etag))
     
-    budget_data = []
-    for budget in budgets:
-        current_amount, status = await calculate_budget_progress(db, budget, current_user.id)
-        progress = (current_amount / budget.amount * 100) if budget.amount > 0 else 0
-        
-        budget_data.append({
-            "id": str(budget.id),
-            "name": budget.name,
-            "type": budget.type.value if hasattr(budget.type, 'value') else str(budget.type),
-            "category": budget.category,
-            "amount": budget.amount,
-            "current_amount": current_amount,
-            "progress_percent": progress,
-            "alert_at_percent": budget.alert_at_percent,
-            "is_active": budget.is_active,
-        })
+    # Each query gets its own session so they overlap; the quarter window
+    # is a superset of what the month-based insights read
+    async with (
+        async_session_maker() as comparison_session,
+        async_session_maker() as health_session,
+        async_session_maker() as budget_session
+    ):
+        tx_data, spending_comparisons, health_totals, budget_data = await asyncio.gather(
+            load_transaction_data(db, current_user.id, fingerprint, days=QUARTER_WINDOW_DAYS),
+            _spending_comparisons_payload(comparison_session, current_user.id, currency_symbol),
+            _load_health_totals(health_session, current_user.id),
+            _load_budget_data(budget_session, current_user.id)
+        )
     
-    # Generate nudges
-    nudges_data = generate_proactive_nudges(tx_data, budget_data, currency_symbol)
+    # The summary and nudges see the same month window as their own endpoints,
+    # so both paths build identical inputs and prompts
+    month_tx_data = _within_window(tx_data, MONTH_WINDOW_DAYS)
     
-    return ProactiveNudgesResponse(
-        nudges=nudges_data["nudges"],
-        summary=nudges_data["summary"],
-        generated_at=nudges_data["generated_at"]
+    # One Gemini call writes both the summary and the tips, overlapping the worker-thread calculations
+    health_data = calculate_health_score(**health_totals, currency_symbol=currency_symbol)
+    texts, smart_predictions, nudges = await asyncio.gather(
+        generate_summary_and_tips(month_tx_data, health_data, currency_symbol, language_code),
+        _smart_predictions_payload(tx_data, currency_symbol),
+        _nudges_payload(month_tx_data, budget_data, currency_symbol)
     )
+    
+    response = {
+        "weekly_summary": {"summary": texts["summary"]},
+        "health_score": {**health_data, "tips": texts["tips"]},
+        "spending_comparisons": spending_comparisons,
+        "smart_predictions": smart_predictions,
+        "nudges": nudges,
+    }
+    await response_cache.set(cache_key, response, ttl=INSIGHTS_CACHE_TTL)
+    return ORJSONResponse(response, headers=_insights_headers(etag))
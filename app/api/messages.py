@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, delete, func, bindparam, Integer
 from uuid import UUID
 
 from app.core.database import get_db
@@ -11,6 +11,17 @@ from app.api.deps import get_current_user
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
 
+# Statement skeletons built once; handlers only bind parameters
+# count(*) OVER () returns the total with the page in one round trip
+_LIST_MESSAGES = (
+    select(Message, func.count().over().label("total"))
+    .where(Message.user_id == bindparam("user_id"))
+    .order_by(Message.timestamp.asc())
+    .offset(bindparam("skip", type_=Integer))
+    .limit(bindparam("limit", type_=Integer))
+)
+_COUNT_MESSAGES = select(func.count(Message.id)).where(Message.user_id == bindparam("user_id"))
+
 
 @router.get("", response_model=MessageListResponse)
 async def list_messages(
@@ -19,16 +30,20 @@ async def list_messages(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Message).where(Message.user_id == current_user.id)
-    query = query.order_by(Message.timestamp.asc()).offset(skip).limit(limit)
+    params = {"user_id": current_user.id, "skip": skip, "limit": limit}
     
-    result = await db.execute(query)
-    messages = result.scalars().all()
+    result = await db.execute(_LIST_MESSAGES, params)
+    rows = result.all()
+    messages = [row.Message for row in rows]
     
-    # Get total count
-    count_query = select(func.count(Message.id)).where(Message.user_id == current_user.id)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    # A page past the end has no rows to carry the total
+    if rows:
+        total = rows[0].total
+    elif skip:
+        count_result = await db.execute(_COUNT_MESSAGES, params)
+        total = count_result.scalar()
+    else:
+        total = 0
     
     return MessageListResponse(messages=messages, total=total)
 
@@ -63,14 +78,10 @@ async def clear_messages(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Message).where(Message.user_id == current_user.id)
+    # One statement, without loading the messages first
+    await db.execute(
+        delete(Message).where(Message.user_id == current_user.id)
     )
-    messages = result.scalars().all()
-    
-    for msg in messages:
-        await db.delete(msg)
-    
     await db.commit()
 
 
@@ -81,15 +92,13 @@ async def delete_message(
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
-        select(Message).where(
+        delete(Message).where(
             Message.id == message_id,
             Message.user_id == current_user.id
         )
     )
-    message = result.scalar_one_or_none()
     
-    if not message:
+    if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
     
-    await db.delete(message)
     await db.commit()
@@ -1,19 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, type_coerce, String
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime, timezone
 
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.models.user import User
 from app.models.transaction import Transaction, TransactionType, DebtStatus
-from app.models.contact import Contact
 from app.schemas.transaction import (
     TransactionCreate, TransactionUpdate, TransactionResponse,
     TransactionListResponse, BalanceSummary
 )
 from app.api.deps import get_current_user
+from app.api.contacts import resolve_contact_ids
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
@@ -54,27 +55,12 @@ async def create_transaction(
 ):
     # Handle contact linking
     contact_id = tx_data.contact_id
+    resolved_contact = False
     if tx_data.contact_name and not contact_id:
-        # Try to find existing contact by name
-        result = await db.execute(
-            select(Contact).where(
-                Contact.user_id == current_user.id,
-                func.lower(Contact.name) == tx_data.contact_name.lower()
-            )
-        )
-        existing_contact = result.scalar_one_or_none()
-        
-        if existing_contact:
-            contact_id = existing_contact.id
-        else:
-            # Create new contact
-            new_contact = Contact(
-                user_id=current_user.id,
-                name=tx_data.contact_name
-            )
-            db.add(new_contact)
-            await db.flush()
-            contact_id = new_contact.id
+        # Find the contact by name, creating it if needed
+        contact_ids = await resolve_contact_ids(db, current_user.id, [tx_data.contact_name])
+        contact_id = contact_ids[tx_data.contact_name]
+        resolved_contact = True
     
     # Normalize due_date to remove timezone info if present
     due_date = tx_data.due_date
@@ -185,6 +171,8 @@ async def create_transaction(
         
         # Commit all transactions
         await db.commit()
+        if resolved_contact:
+            await response_cache.invalidate("contacts", current_user.id)
         
         # Refresh and return the first transaction (or all if needed)
         if created_transactions:
@@ -200,6 +188,8 @@ async def create_transaction(
     db.add(new_tx)
     await db.commit()
     await db.refresh(new_tx)
+    if resolved_contact:
+        await response_cache.invalidate("contacts", current_user.id)
     
     return new_tx
 
@@ -209,17 +199,24 @@ async def get_balances(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # One summed row per (account, type) instead of one ORM object per transaction;
+    # the varchar enum columns are read back as plain strings
     result = await db.execute(
-        select(Transaction).where(Transaction.user_id == current_user.id)
+        select(
+            type_coerce(Transaction.account, String).label("account"),
+            type_coerce(Transaction.type, String).label("type"),
+            func.sum(Transaction.amount).label("total")
+        )
+        .where(Transaction.user_id == current_user.id)
+        .group_by(Transaction.account, Transaction.type)
     )
-    transactions = result.scalars().all()
     
     balances = {"cash": 0.0, "bank": 0.0, "credit": 0.0, "loan": 0.0}
     
-    for tx in transactions:
-        amt = tx.amount
-        acct = tx.account.value if tx.account else "cash"
-        tx_type = tx.type.value if tx.type else ""
+    for row in result.mappings():
+        amt = row["total"] or 0.0
+        acct = row["account"] or "cash"
+        tx_type = row["type"] or ""
         
         if tx_type == "income":
             balances[acct] += amt
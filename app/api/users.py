@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, invalidate_user_claims
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -27,5 +27,6 @@ async def update_me(
     
     await db.commit()
     await db.refresh(current_user)
+    invalidate_user_claims(current_user.id)
     
     return current_user
@@ -0,0 +1,83 @@
+import time
+from typing import Any, Optional
+from uuid import UUID, uuid4
+
+import orjson
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # Redis is optional; without it each process caches on its own
+    redis_asyncio = None
+
+
+class ResponseCache:
+    """Per-user response cache, shared through Redis when REDIS_URL is set.
+
+    Entries are invalidated by bumping a per-user version token for a
+    namespace. Callers put the token in their keys, so old entries are
+    never read again and simply expire.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, maxsize: int = 4096):
+        self._redis = redis_asyncio.from_url(redis_url) if redis_url and redis_asyncio else None
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=300)
+        self._local_versions: TTLCache = TTLCache(maxsize=maxsize, ttl=24 * 60 * 60)
+
+    async def get(self, key: str) -> Optional[Any]:
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(key)
+            except Exception:
+                return None
+            return orjson.loads(value) if value is not None else None
+
+        entry = self._local.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store a JSON-compatible value (datetimes and UUIDs allowed) for ttl seconds."""
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, orjson.dumps(value), ex=ttl)
+            except Exception:
+                pass
+            return
+
+        self._local[key] = (time.monotonic() + ttl, value)
+
+    async def user_version(self, namespace: str, user_id: UUID) -> str:
+        """Current version token of a user's entries in a namespace."""
+        key = f"version:{namespace}:{user_id}"
+        if self._redis is not None:
+            try:
+                # A fresh random token, never a reset counter, when the key is missing
+                await self._redis.set(key, uuid4().hex, nx=True)
+                version = await self._redis.get(key)
+            except Exception:
+                return uuid4().hex
+            return version.decode() if version is not None else uuid4().hex
+
+        version = self._local_versions.get(key)
+        if version is None:
+            version = self._local_versions[key] = uuid4().hex
+        return version
+
+    async def invalidate(self, namespace: str, user_id: UUID) -> None:
+        """Make every cached entry of a user's namespace unreachable."""
+        key = f"version:{namespace}:{user_id}"
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, uuid4().hex)
+            except Exception:
+                pass
+            return
+
+        self._local_versions[key] = uuid4().hex
+
+
+response_cache = ResponseCache(settings.REDIS_URL)
@@ -0,0 +1,16 @@
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """Gzip responses, except server-sent event streams.
+
+    Gzip holds small writes back until it has a full block, which would
+    stall each event, so routes under a /stream path go out uncompressed.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
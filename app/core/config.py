@@ -30,6 +30,14 @@ class Settings(BaseSettings):
     # Gemini AI
     GEMINI_API_KEY: Optional[str] = None
     
+    # Migrations on startup: off (run `alembic upgrade head` yourself),
+    # sync (finish before serving) or async (start serving while they run,
+    # with /health returning 503 until they finish)
+    MIGRATION_MODE: str = "off"
+    
+    # Response cache shared across workers; in-process cache when unset
+    REDIS_URL: Optional[str] = None
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
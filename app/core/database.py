@@ -1,9 +1,20 @@
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+# Room for every statement shape the app compiles, so the compiled cache never churns.
+# asyncpg prepares each statement once per connection; its cache gets the same headroom
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    query_cache_size=1200,
+    connect_args={"prepared_statement_cache_size": 500},
+    # JSON columns (message drafts and attachments) go through orjson too
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads
+)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
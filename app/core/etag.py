@@ -0,0 +1,25 @@
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from fastapi import Request
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given fingerprint parts."""
+    fingerprint = "|".join(str(part) for part in parts)
+    return f'"{hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_day() -> str:
+    """Today's UTC date, for tags that roll over daily; every tag uses this one clock."""
+    return datetime.utcnow().date().isoformat()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates or "*" in candidates
@@ -0,0 +1,21 @@
+import asyncio
+import os
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+
+def run_migrations() -> None:
+    """Upgrade the database to the latest revision."""
+    command.upgrade(Config(ALEMBIC_INI), "head")
+
+
+async def run_migrations_async() -> None:
+    """Run migrations in a worker thread so the event loop keeps serving."""
+    try:
+        await asyncio.to_thread(run_migrations)
+    except Exception as e:
+        print(f"[ERROR] Migrations failed: {e}")
+        raise
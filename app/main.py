@@ -1,13 +1,33 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
+from app.core.compression import StreamAwareGZipMiddleware
+from app.core.migrations import run_migrations_async
 from app.api import auth, users, transactions, contacts, messages, drafts, ai, insights, budgets
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.migrations_task = None
+    if settings.MIGRATION_MODE == "sync":
+        await run_migrations_async()
+    elif settings.MIGRATION_MODE == "async":
+        # Keep a reference so the task isn't garbage collected mid-run
+        app.state.migrations_task = asyncio.create_task(run_migrations_async())
+    yield
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware - allow all origins for development
@@ -19,6 +39,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies worth the CPU; insight and list payloads repeat keys heavily
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(users.router, prefix=settings.API_V1_STR)
@@ -42,4 +65,12 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    # In async migration mode the process is up before the schema is; report
+    # not ready until the upgrade finishes, and stay out of rotation if it fails
+    task = app.state.migrations_task
+    if task is not None:
+        if not task.done():
+            return ORJSONResponse({"status": "migrating"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if task.cancelled() or task.exception() is not None:
+            return ORJSONResponse({"status": "migrations_failed"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
     return {"status": "healthy"}
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, String, DateTime, Float, Enum, ForeignKey, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 import enum
@@ -41,8 +42,8 @@ class Budget(Base):
     alert_at_percent = Column(Float, default=80)  # Alert when reaching this % of budget
     is_active = Column(Boolean, default=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
     
     # Period tracking
     period_start = Column(DateTime, nullable=True)  # When current period started
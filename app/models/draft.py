@@ -32,7 +32,7 @@ class Draft(Base):
     due_date = Column(DateTime, nullable=True)
     linked_transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id", ondelete="SET NULL"), nullable=True)
     
-    status = Column(SQLEnum(DraftStatus, name="draftstatus", create_constraint=False), default=DraftStatus.pending)
+    status = Column(SQLEnum(DraftStatus, native_enum=False, length=32), default=DraftStatus.pending)
     
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
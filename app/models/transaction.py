@@ -1,6 +1,7 @@
 from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Enum, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 import enum
@@ -43,20 +44,20 @@ class Transaction(Base):
     description = Column(String(500), nullable=False)
     category = Column(String(100), nullable=True)
     
-    type = Column(Enum(TransactionType), nullable=False)
-    account = Column(Enum(AccountType), nullable=False)
+    type = Column(Enum(TransactionType, native_enum=False, length=32), nullable=False)
+    account = Column(Enum(AccountType, native_enum=False, length=32), nullable=False)
     
     contact_name = Column(String(255), nullable=True)
     contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id", ondelete="SET NULL"), nullable=True)
     
     linked_transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id", ondelete="SET NULL"), nullable=True)
     remaining_amount = Column(Float, nullable=True)
-    status = Column(Enum(DebtStatus), nullable=True)
+    status = Column(Enum(DebtStatus, native_enum=False, length=32), nullable=True)
     
     metadata_json = Column(JSON, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="transactions")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_serializer
 from typing import Optional, List, Dict, Any
 from app.schemas.message import Attachment
 
@@ -33,3 +33,13 @@ class AIParseResponse(BaseModel):
     is_question: bool
     question_response: Optional[str] = None
     is_correction: Optional[bool] = None
+
+    @model_serializer(mode="wrap")
+    def _omit_unset_flags(self, handler):
+        # Only the top-level optional flags are left out when empty; the parsed
+        # transactions keep their null fields
+        data = handler(self)
+        for key in ("question_response", "is_correction"):
+            if data.get(key) is None:
+                data.pop(key, None)
+        return data
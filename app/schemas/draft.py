@@ -71,6 +71,10 @@ class DraftResponse(DraftBase):
         from_attributes = True
 
 
+class DraftBatchConfirm(BaseModel):
+    draft_ids: List[UUID]
+
+
 class DraftListResponse(BaseModel):
     drafts: List[DraftResponse]
     total: int
@@ -1,9 +1,10 @@
 from google import genai
 from google.genai import types
 from typing import List, Dict, Any, Optional
-import json
+import orjson
 
 from app.core.config import settings
+from app.schemas.message import Attachment
 
 SYSTEM_INSTRUCTION = """
 You are VanTrack AI, a sleek and ultra-responsive financial co-pilot.
@@ -139,7 +140,7 @@ async def parse_financial_input(
     currency_code: str = "USD",
     currency_symbol: str = "$",
     language_code: str = "en",
-    attachments: Optional[List[Dict[str, Any]]] = None
+    attachments: Optional[List[Attachment]] = None
 ) -> Dict[str, Any]:
     
     if not settings.GEMINI_API_KEY:
@@ -195,17 +196,15 @@ async def parse_financial_input(
         # Build user message parts
         user_parts = []
         
-        # Add attachments if any
+        # Add attachments if any (type is already validated as image or audio)
         if attachments:
             for att in attachments:
-                if att.get("type") not in ["image", "audio"]:
-                    continue
-                data_url = att.get("data_url", "")
+                data_url = att.data_url
                 data = data_url.split(",")[1] if "," in data_url else data_url
                 if data:
                     user_parts.append(types.Part.from_bytes(
                         data=bytes(data, 'utf-8'),
-                        mime_type=att.get("mime_type", "image/png")
+                        mime_type=att.mime_type
                     ))
         
         # Add input text
@@ -281,7 +280,7 @@ async def parse_financial_input(
             raise ValueError("Empty response from AI")
         print("Ai response: ", text)
         
-        parsed = json.loads(text)
+        parsed = orjson.loads(text)
         print(f"[DEBUG] AI Response: {parsed}")  # Debug log
         return parsed
     
@@ -1,10 +1,13 @@
 from google import genai
 from google.genai import types
-from typing import List, Dict, Any, Optional
-import json
+from typing import AsyncIterator, List, Dict, Any, Optional
+import orjson
+import asyncio
+import hashlib
 from datetime import datetime, timedelta
 
 from app.core.config import settings
+from app.core.cache import response_cache
 
 
 INSIGHTS_SYSTEM_INSTRUCTION = """
@@ -68,17 +71,149 @@ Detect the language of the question and respond in that same language.
 """
 
 
-async def generate_weekly_summary(
-    transactions: List[Dict[str, Any]],
-    currency_symbol: str = "$",
-    language_code: str = "en"
+def _tx_date(tx: Dict[str, Any]) -> Optional[datetime]:
+    """Transaction date as a naive datetime; ISO strings are accepted too."""
+    tx_date = tx.get('date')
+    if isinstance(tx_date, str):
+        try:
+            return datetime.fromisoformat(tx_date.replace('Z', '+00:00').replace('+00:00', ''))
+        except ValueError:
+            return None
+    return tx_date if isinstance(tx_date, datetime) else None
+
+
+def _is_since(tx: Dict[str, Any], cutoff: datetime) -> bool:
+    """Whether a transaction is dated at or after cutoff."""
+    tx_date = _tx_date(tx)
+    return tx_date is not None and tx_date >= cutoff
+
+
+# Gemini calls in flight in this process, by prompt cache key
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def _prompt_cache_key(
+    context: str,
+    system_instruction: str,
+    temperature: float,
+    max_output_tokens: int,
+    response_schema: Optional[Dict[str, Any]] = None
 ) -> str:
-    """Generate AI-powered weekly financial summary."""
-    
-    if not settings.GEMINI_API_KEY:
-        return "AI insights unavailable. Please configure GEMINI_API_KEY."
+    """Cache key of a Gemini prompt's answer."""
+    # The prompt embeds the user's data and today's date, so it is the whole cache key
+    schema = orjson.dumps(response_schema, option=orjson.OPT_SORT_KEYS).decode() if response_schema else ""
+    digest = hashlib.blake2b(
+        f"{system_instruction}\0{temperature}\0{max_output_tokens}\0{schema}\0{context}".encode(),
+        digest_size=16
+    ).hexdigest()
+    return f"llm:{digest}"
+
+
+def _prompt_request(
+    context: str,
+    system_instruction: str,
+    temperature: float,
+    max_output_tokens: int,
+    response_schema: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Keyword arguments of a Gemini generate call; a schema asks for JSON output."""
+    return {
+        "model": "gemini-2.0-flash",
+        "contents": [types.Content(role="user", parts=[types.Part.from_text(text=context)])],
+        "config": types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            response_mime_type="application/json" if response_schema else None,
+            response_schema=response_schema
+        ),
+    }
+
+
+async def _request_text(
+    client: genai.Client,
+    cache_key: str,
+    context: str,
+    system_instruction: str,
+    temperature: float,
+    max_output_tokens: int,
+    ttl: int,
+    response_schema: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """Call Gemini and cache a non-empty answer."""
+    response = await client.aio.models.generate_content(
+        **_prompt_request(context, system_instruction, temperature, max_output_tokens, response_schema)
+    )
+    if not response.text:
+        return None
     
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    text = response.text.strip()
+    await response_cache.set(cache_key, text, ttl=ttl)
+    return text
+
+
+async def _generate_text(
+    client: genai.Client,
+    context: str,
+    system_instruction: str,
+    temperature: float,
+    max_output_tokens: int,
+    ttl: int,
+    response_schema: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """Run a Gemini prompt, reusing the answer cached for an identical prompt."""
+    cache_key = _prompt_cache_key(context, system_instruction, temperature, max_output_tokens, response_schema)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Identical prompts arriving together share one call instead of each paying for it
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_request_text(
+            client, cache_key, context, system_instruction, temperature, max_output_tokens, ttl, response_schema
+        ))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    # Shielded so one caller disconnecting doesn't cancel the call for the others
+    return await asyncio.shield(task)
+
+
+async def _stream_text(
+    client: genai.Client,
+    context: str,
+    system_instruction: str,
+    temperature: float,
+    max_output_tokens: int,
+    ttl: int
+) -> AsyncIterator[str]:
+    """Yield a Gemini answer as it is generated, or at once when an identical prompt is cached."""
+    cache_key = _prompt_cache_key(context, system_instruction, temperature, max_output_tokens)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+    
+    parts = []
+    async for chunk in await client.aio.models.generate_content_stream(
+        **_prompt_request(context, system_instruction, temperature, max_output_tokens)
+    ):
+        if chunk.text:
+            parts.append(chunk.text)
+            yield chunk.text
+    
+    # Only a complete answer is cached, so the buffered endpoints can reuse it
+    text = "".join(parts).strip()
+    if text:
+        await response_cache.set(cache_key, text, ttl=ttl)
+
+
+def _weekly_summary_context(
+    transactions: List[Dict[str, Any]],
+    currency_symbol: str,
+    language_code: str
+) -> str:
+    """Build the weekly summary prompt from the user's transactions."""
     
     # Prepare transaction data for AI
     today = datetime.now()
@@ -90,13 +225,8 @@ async def generate_weekly_summary(
     last_month = []
     
     for tx in transactions:
-        tx_date = tx.get('date')
-        if isinstance(tx_date, str):
-            try:
-                tx_date = datetime.fromisoformat(tx_date.replace('Z', '+00:00'))
-            except:
-                continue
-        elif not isinstance(tx_date, datetime):
+        tx_date = _tx_date(tx)
+        if tx_date is None:
             continue
             
         if tx_date >= week_ago:
@@ -188,38 +318,68 @@ async def generate_weekly_summary(
 Please provide a friendly, insightful weekly summary based on this data.
 Focus on: key observations, spending patterns, and 1-2 actionable tips.
 """
+    return context
+
+
+async def generate_weekly_summary(
+    transactions: List[Dict[str, Any]],
+    currency_symbol: str = "$",
+    language_code: str = "en"
+) -> str:
+    """Generate AI-powered weekly financial summary."""
+    
+    if not settings.GEMINI_API_KEY:
+        return "AI insights unavailable. Please configure GEMINI_API_KEY."
+    
+    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    context = _weekly_summary_context(transactions, currency_symbol, language_code)
     
     try:
-        response = await client.aio.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[types.Content(role="user", parts=[types.Part.from_text(text=context)])],
-            config=types.GenerateContentConfig(
-                system_instruction=INSIGHTS_SYSTEM_INSTRUCTION,
-                temperature=0.7,
-                max_output_tokens=500
-            )
+        text = await _generate_text(
+            client, context, INSIGHTS_SYSTEM_INSTRUCTION,
+            temperature=0.7, max_output_tokens=500, ttl=60 * 60
         )
         
-        return response.text.strip() if response.text else "Unable to generate insights at this time."
+        return text or "Unable to generate insights at this time."
         
     except Exception as e:
         print(f"[ERROR] Insights generation failed: {e}")
         return f"Unable to generate insights: {str(e)}"
 
 
-async def answer_financial_question(
-    question: str,
+async def stream_weekly_summary(
     transactions: List[Dict[str, Any]],
-    contacts: List[Dict[str, Any]],
     currency_symbol: str = "$",
     language_code: str = "en"
-) -> str:
-    """Answer user's question about their financial data."""
+) -> AsyncIterator[str]:
+    """Stream the AI-powered weekly financial summary as it is generated."""
     
     if not settings.GEMINI_API_KEY:
-        return "AI unavailable. Please configure GEMINI_API_KEY."
+        yield "AI insights unavailable. Please configure GEMINI_API_KEY."
+        return
     
     client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    context = _weekly_summary_context(transactions, currency_symbol, language_code)
+    
+    try:
+        async for text in _stream_text(
+            client, context, INSIGHTS_SYSTEM_INSTRUCTION,
+            temperature=0.7, max_output_tokens=500, ttl=60 * 60
+        ):
+            yield text
+        
+    except Exception as e:
+        print(f"[ERROR] Insights streaming failed: {e}")
+        yield f"Unable to generate insights: {str(e)}"
+
+
+def _question_context(
+    question: str,
+    transactions: List[Dict[str, Any]],
+    contacts: List[Dict[str, Any]],
+    currency_symbol: str
+) -> str:
+    """Build the question prompt from the user's transactions and contacts."""
     
     today = datetime.now()
     
@@ -278,25 +438,65 @@ async def answer_financial_question(
 
 Please answer the question based on the data above. Be specific with numbers and dates.
 """
+    return context
+
+
+async def answer_financial_question(
+    question: str,
+    transactions: List[Dict[str, Any]],
+    contacts: List[Dict[str, Any]],
+    currency_symbol: str = "$",
+    language_code: str = "en"
+) -> str:
+    """Answer user's question about their financial data."""
+    
+    if not settings.GEMINI_API_KEY:
+        return "AI unavailable. Please configure GEMINI_API_KEY."
+    
+    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    context = _question_context(question, transactions, contacts, currency_symbol)
     
     try:
-        response = await client.aio.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[types.Content(role="user", parts=[types.Part.from_text(text=context)])],
-            config=types.GenerateContentConfig(
-                system_instruction=QUESTION_SYSTEM_INSTRUCTION,
-                temperature=0.3,
-                max_output_tokens=400
-            )
+        text = await _generate_text(
+            client, context, QUESTION_SYSTEM_INSTRUCTION,
+            temperature=0.3, max_output_tokens=400, ttl=15 * 60
         )
         
-        return response.text.strip() if response.text else "I couldn't find an answer to that question."
+        return text or "I couldn't find an answer to that question."
         
     except Exception as e:
         print(f"[ERROR] Question answering failed: {e}")
         return f"Unable to answer: {str(e)}"
 
 
+async def stream_financial_answer(
+    question: str,
+    transactions: List[Dict[str, Any]],
+    contacts: List[Dict[str, Any]],
+    currency_symbol: str = "$",
+    language_code: str = "en"
+) -> AsyncIterator[str]:
+    """Stream the answer to a user's question as it is generated."""
+    
+    if not settings.GEMINI_API_KEY:
+        yield "AI unavailable. Please configure GEMINI_API_KEY."
+        return
+    
+    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    context = _question_context(question, transactions, contacts, currency_symbol)
+    
+    try:
+        async for text in _stream_text(
+            client, context, QUESTION_SYSTEM_INSTRUCTION,
+            temperature=0.3, max_output_tokens=400, ttl=15 * 60
+        ):
+            yield text
+        
+    except Exception as e:
+        print(f"[ERROR] Question streaming failed: {e}")
+        yield f"Unable to answer: {str(e)}"
+
+
 HEALTH_SCORE_INSTRUCTION = """
 You are VanTrack AI, a friendly financial health advisor.
 Based on the user's Financial Health Score breakdown, provide 2-3 specific, actionable tips to improve their score.
@@ -318,36 +518,17 @@ CRITICAL: Respond in the SAME language as specified in the user's language_code.
 
 
 def calculate_health_score(
-    transactions: List[Dict[str, Any]],
+    month_income: float,
+    month_expense: float,
+    total_receivable: float,
+    total_payable: float,
+    weekly_expenses: List[float],
     currency_symbol: str = "$"
 ) -> Dict[str, Any]:
-    """Calculate financial health score (0-100) based on multiple factors."""
-    
-    today = datetime.now()
-    month_ago = today - timedelta(days=30)
-    three_months_ago = today - timedelta(days=90)
-    
-    # Parse dates and filter transactions
-    def parse_date(tx):
-        tx_date = tx.get('date')
-        if isinstance(tx_date, str):
-            try:
-                return datetime.fromisoformat(tx_date.replace('Z', '+00:00').replace('+00:00', ''))
-            except:
-                return None
-        return tx_date if isinstance(tx_date, datetime) else None
-    
-    all_txs = [(tx, parse_date(tx)) for tx in transactions]
-    all_txs = [(tx, d) for tx, d in all_txs if d is not None]
-    
-    last_month = [(tx, d) for tx, d in all_txs if d >= month_ago]
-    last_3_months = [(tx, d) for tx, d in all_txs if d >= three_months_ago]
+    """Calculate financial health score (0-100) from last month's and open-debt totals."""
     
     # 1. SAVINGS RATE (0-30 points)
     # (Income - Expenses) / Income * 100
-    month_income = sum(tx['amount'] for tx, d in last_month if tx.get('type') == 'income')
-    month_expense = sum(tx['amount'] for tx, d in last_month if tx.get('type') == 'expense')
-    
     if month_income > 0:
         savings_rate = (month_income - month_expense) / month_income
         savings_score = min(30, max(0, savings_rate * 100))  # 30% savings = full points
@@ -357,19 +538,6 @@ def calculate_health_score(
     
     # 2. DEBT-TO-INCOME RATIO (0-25 points)
     # Lower is better: <20% = excellent, >50% = poor
-    total_payable = sum(
-        tx.get('remaining_amount', tx['amount'])
-        for tx in transactions
-        if tx.get('type') in ['credit_payable', 'loan_payable']
-        and tx.get('status') != 'settled'
-    )
-    total_receivable = sum(
-        tx.get('remaining_amount', tx['amount'])
-        for tx in transactions
-        if tx.get('type') in ['credit_receivable', 'loan_receivable']
-        and tx.get('status') != 'settled'
-    )
-    
     avg_monthly_income = month_income if month_income > 0 else 1
     debt_ratio = total_payable / avg_monthly_income if avg_monthly_income > 0 else 0
     
@@ -382,16 +550,10 @@ def calculate_health_score(
     
     # 3. SPENDING CONSISTENCY (0-25 points)
     # Compare weekly spending variance - lower variance = more consistent
-    weeks_spending = {}
-    for tx, d in last_month:
-        if tx.get('type') == 'expense':
-            week_num = d.isocalendar()[1]
-            weeks_spending[week_num] = weeks_spending.get(week_num, 0) + tx['amount']
-    
-    if len(weeks_spending) >= 2:
-        avg_weekly = sum(weeks_spending.values()) / len(weeks_spending)
+    if len(weekly_expenses) >= 2:
+        avg_weekly = sum(weekly_expenses) / len(weekly_expenses)
         if avg_weekly > 0:
-            variance = sum((v - avg_weekly) ** 2 for v in weeks_spending.values()) / len(weeks_spending)
+            variance = sum((v - avg_weekly) ** 2 for v in weekly_expenses) / len(weekly_expenses)
             std_dev = variance ** 0.5
             cv = std_dev / avg_weekly  # Coefficient of variation
             consistency_score = max(0, 25 - cv * 25)  # Lower CV = higher score
@@ -454,7 +616,7 @@ def calculate_health_score(
             "consistency": {
                 "score": round(consistency_score, 1),
                 "max": 25,
-                "value": f"{len(weeks_spending)} weeks tracked",
+                "value": f"{len(weekly_expenses)} weeks tracked",
                 "label": "Spending Consistency"
             },
             "emergency_fund": {
@@ -474,17 +636,12 @@ def calculate_health_score(
     }
 
 
-async def generate_health_tips(
+def _health_tips_context(
     health_data: Dict[str, Any],
-    currency_symbol: str = "$",
-    language_code: str = "en"
+    currency_symbol: str,
+    language_code: str
 ) -> str:
-    """Generate AI tips to improve financial health score."""
-    
-    if not settings.GEMINI_API_KEY:
-        return "AI tips unavailable. Please configure GEMINI_API_KEY."
-    
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    """Build the health tips prompt from a calculated health score."""
     
     breakdown = health_data['breakdown']
     summary = health_data['summary']
@@ -518,25 +675,98 @@ async def generate_health_tips(
 
 Please provide 2-3 specific tips to improve the score, focusing on the lowest-scoring areas.
 """
+    return context
+
+
+async def generate_health_tips(
+    health_data: Dict[str, Any],
+    currency_symbol: str = "$",
+    language_code: str = "en"
+) -> str:
+    """Generate AI tips to improve financial health score."""
+    
+    if not settings.GEMINI_API_KEY:
+        return "AI tips unavailable. Please configure GEMINI_API_KEY."
+    
+    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    context = _health_tips_context(health_data, currency_symbol, language_code)
     
     try:
-        response = await client.aio.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[types.Content(role="user", parts=[types.Part.from_text(text=context)])],
-            config=types.GenerateContentConfig(
-                system_instruction=HEALTH_SCORE_INSTRUCTION,
-                temperature=0.5,
-                max_output_tokens=300
-            )
+        text = await _generate_text(
+            client, context, HEALTH_SCORE_INSTRUCTION,
+            temperature=0.5, max_output_tokens=300, ttl=60 * 60
         )
         
-        return response.text.strip() if response.text else "Keep tracking your finances to get personalized tips!"
+        return text or "Keep tracking your finances to get personalized tips!"
         
     except Exception as e:
         print(f"[ERROR] Health tips generation failed: {e}")
         return "Keep tracking your finances to get personalized tips!"
 
 
+COMBINED_INSIGHTS_INSTRUCTION = f"""
+You write two pieces of text for the same user in one reply, returned as JSON.
+
+"summary" is their weekly summary, following these instructions:
+{INSIGHTS_SYSTEM_INSTRUCTION}
+
+"tips" are their health score tips, following these instructions:
+{HEALTH_SCORE_INSTRUCTION}
+"""
+
+COMBINED_INSIGHTS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "tips": {"type": "STRING"},
+    },
+    "required": ["summary", "tips"],
+}
+
+
+async def generate_summary_and_tips(
+    transactions: List[Dict[str, Any]],
+    health_data: Dict[str, Any],
+    currency_symbol: str = "$",
+    language_code: str = "en"
+) -> Dict[str, str]:
+    """Generate the weekly summary and health tips with a single Gemini call."""
+    
+    if not settings.GEMINI_API_KEY:
+        return {
+            "summary": "AI insights unavailable. Please configure GEMINI_API_KEY.",
+            "tips": "AI tips unavailable. Please configure GEMINI_API_KEY."
+        }
+    
+    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    context = (
+        "# WEEKLY SUMMARY DATA\n"
+        + _weekly_summary_context(transactions, currency_symbol, language_code)
+        + "\n# HEALTH SCORE DATA\n"
+        + _health_tips_context(health_data, currency_symbol, language_code)
+    )
+    
+    try:
+        text = await _generate_text(
+            client, context, COMBINED_INSIGHTS_INSTRUCTION,
+            temperature=0.6, max_output_tokens=800, ttl=60 * 60,
+            response_schema=COMBINED_INSIGHTS_SCHEMA
+        )
+        result = orjson.loads(text) if text else {}
+        if result.get("summary") and result.get("tips"):
+            return {"summary": result["summary"].strip(), "tips": result["tips"].strip()}
+        
+    except Exception as e:
+        print(f"[ERROR] Combined insights generation failed: {e}")
+    
+    # Fall back to the separate prompts, which also reuse their own cached answers
+    summary, tips = await asyncio.gather(
+        generate_weekly_summary(transactions, currency_symbol, language_code),
+        generate_health_tips(health_data, currency_symbol, language_code)
+    )
+    return {"summary": summary, "tips": tips}
+
+
 # Benchmark averages (based on typical spending patterns)
 # These could be replaced with real aggregate data in the future
 SPENDING_BENCHMARKS = {
@@ -554,45 +784,12 @@ SPENDING_BENCHMARKS = {
 
 
 def calculate_spending_comparisons(
-    transactions: List[Dict[str, Any]],
+    monthly_income: float,
+    monthly_expenses: float,
+    category_spending: Dict[str, float],
     currency_symbol: str = "$"
 ) -> Dict[str, Any]:
-    """Compare user's spending to anonymous benchmarks."""
-    
-    today = datetime.now()
-    month_ago = today - timedelta(days=30)
-    
-    # Parse dates and filter to last month
-    def parse_date(tx):
-        tx_date = tx.get('date')
-        if isinstance(tx_date, str):
-            try:
-                return datetime.fromisoformat(tx_date.replace('Z', '+00:00').replace('+00:00', ''))
-            except:
-                return None
-        return tx_date if isinstance(tx_date, datetime) else None
-    
-    last_month_txs = [
-        tx for tx in transactions
-        if (d := parse_date(tx)) and d >= month_ago
-    ]
-    
-    # Calculate monthly income and expenses
-    monthly_income = sum(
-        tx['amount'] for tx in last_month_txs 
-        if tx.get('type') == 'income'
-    )
-    monthly_expenses = sum(
-        tx['amount'] for tx in last_month_txs 
-        if tx.get('type') == 'expense'
-    )
-    
-    # Group expenses by category
-    category_spending: Dict[str, float] = {}
-    for tx in last_month_txs:
-        if tx.get('type') == 'expense':
-            category = (tx.get('category') or 'other').lower()
-            category_spending[category] = category_spending.get(category, 0) + tx['amount']
+    """Compare user's last-month totals (expenses keyed by lowercased category) to anonymous benchmarks."""
     
     # Calculate comparisons
     comparisons = []
@@ -606,6 +803,7 @@ def calculate_spending_comparisons(
         comparisons.append({
             "category": "Savings Rate",
             "your_value": f"{actual_savings_rate * 100:.1f}%",
+            "your_pct": None,
             "benchmark": f"{benchmark_savings * 100:.0f}%",
             "difference": diff_pct,
             "is_better": actual_savings_rate >= benchmark_savings,
@@ -672,52 +870,52 @@ def calculate_smart_predictions(
     
     # Analyze last 90 days for patterns
     ninety_days_ago = now - timedelta(days=90)
-    recent_transactions = [
-        t for t in transactions
-        if datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', '')) >= ninety_days_ago
-    ]
-    
-    # Current month transactions
-    current_month_txs = [
-        t for t in transactions
-        if datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', '')) >= current_month_start
-    ]
-    
-    # === 1. CASH FLOW FORECAST ===
-    # Calculate average daily income and expenses from last 90 days
-    total_income_90d = sum(t['amount'] for t in recent_transactions if t['type'] == 'income')
-    total_expenses_90d = sum(t['amount'] for t in recent_transactions if t['type'] == 'expense')
-    
-    avg_daily_income = total_income_90d / 90 if recent_transactions else 0
-    avg_daily_expenses = total_expenses_90d / 90 if recent_transactions else 0
     
-    # Current month actuals
-    current_income = sum(t['amount'] for t in current_month_txs if t['type'] == 'income')
-    current_expenses = sum(t['amount'] for t in current_month_txs if t['type'] == 'expense')
-    current_balance = current_income - current_expenses
-    
-    # Projected end of month
-    projected_income = current_income + (avg_daily_income * days_remaining)
-    projected_expenses = current_expenses + (avg_daily_expenses * days_remaining)
-    projected_balance = projected_income - projected_expenses
-    
-    cash_flow_forecast = {
-        "current_balance": round(current_balance, 2),
-        "projected_end_of_month": round(projected_balance, 2),
-        "projected_income": round(projected_income, 2),
-        "projected_expenses": round(projected_expenses, 2),
-        "days_remaining": days_remaining,
-        "trend": "positive" if projected_balance > current_balance else "negative",
-        "message": f"Based on your patterns, you'll have ~{currency_symbol}{abs(projected_balance):,.0f} by end of month."
-    }
-    
-    # === 2. BILL REMINDERS ===
+    # Accumulate every section's inputs in a single pass over the transactions
+    has_recent = False
+    total_income_90d = 0
+    total_expenses_90d = 0
+    payments_90d = 0
+    current_income = 0
+    current_expenses = 0
     # Find recurring expenses by analyzing description patterns and dates
     expense_patterns = {}
-    for t in recent_transactions:
-        if t['type'] == 'expense':
+    # Find all outstanding debts
+    debts = []
+    for t in transactions:
+        tx_type = t['type']
+        if tx_type in ['credit_payable', 'loan_payable']:
+            remaining = t.get('remaining_amount', t['amount'])
+            if remaining > 0 and t.get('status') != 'settled':
+                # Shaped like DebtItem: the response goes out without model validation
+                due_date = t.get('due_date')
+                debts.append({
+                    'id': str(t['id']),
+                    'description': t['description'],
+                    'contact': t.get('contact_name') or 'Unknown',
+                    'original_amount': t['amount'],
+                    'remaining': remaining,
+                    'due_date': due_date.isoformat() if isinstance(due_date, datetime) else due_date
+                })
+        
+        tx_date = _tx_date(t)
+        if tx_date is None or tx_date < ninety_days_ago:
+            continue
+        has_recent = True
+        in_current_month = tx_date >= current_month_start
+        
+        if tx_type == 'income':
+            total_income_90d += t['amount']
+            if in_current_month:
+                current_income += t['amount']
+        elif tx_type == 'payment_made':
+            payments_90d += t['amount']
+        elif tx_type == 'expense':
+            total_expenses_90d += t['amount']
+            if in_current_month:
+                current_expenses += t['amount']
+            
             desc_lower = t['description'].lower()
-            tx_date = datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', ''))
             day_of_month = tx_date.day
             
             # Group by similar descriptions
@@ -740,6 +938,30 @@ def calculate_smart_predictions(
             expense_patterns[key]['days'].append(day_of_month)
             expense_patterns[key]['descriptions'].append(t['description'])
     
+    # === 1. CASH FLOW FORECAST ===
+    # Average daily income and expenses from last 90 days
+    avg_daily_income = total_income_90d / 90 if has_recent else 0
+    avg_daily_expenses = total_expenses_90d / 90 if has_recent else 0
+    
+    # Current month actuals
+    current_balance = current_income - current_expenses
+    
+    # Projected end of month
+    projected_income = current_income + (avg_daily_income * days_remaining)
+    projected_expenses = current_expenses + (avg_daily_expenses * days_remaining)
+    projected_balance = projected_income - projected_expenses
+    
+    cash_flow_forecast = {
+        "current_balance": round(current_balance, 2),
+        "projected_end_of_month": round(projected_balance, 2),
+        "projected_income": round(projected_income, 2),
+        "projected_expenses": round(projected_expenses, 2),
+        "days_remaining": days_remaining,
+        "trend": "positive" if projected_balance > current_balance else "negative",
+        "message": f"Based on your patterns, you'll have ~{currency_symbol}{abs(projected_balance):,.0f} by end of month."
+    }
+    
+    # === 2. BILL REMINDERS ===
     # Find recurring bills (appeared 2+ times with similar amounts)
     bill_reminders = []
     for key, data in expense_patterns.items():
@@ -771,28 +993,9 @@ def calculate_smart_predictions(
     bill_reminders.sort(key=lambda x: x['days_until_due'])
     
     # === 3. DEBT PAYOFF TIMELINE ===
-    # Find all outstanding debts
-    debts = []
-    for t in transactions:
-        if t['type'] in ['credit_payable', 'loan_payable']:
-            remaining = t.get('remaining_amount', t['amount'])
-            if remaining > 0 and t.get('status') != 'settled':
-                debts.append({
-                    'id': t['id'],
-                    'description': t['description'],
-                    'contact': t.get('contact_name', 'Unknown'),
-                    'original_amount': t['amount'],
-                    'remaining': remaining,
-                    'due_date': t.get('due_date')
-                })
-    
     total_debt = sum(d['remaining'] for d in debts)
     
-    # Calculate average monthly payment towards debt (from payment_made transactions)
-    payments_90d = sum(
-        t['amount'] for t in recent_transactions 
-        if t['type'] == 'payment_made'
-    )
+    # Average monthly payment towards debt (from payment_made transactions)
     avg_monthly_payment = (payments_90d / 3) if payments_90d > 0 else 0
     
     # If no payment history, suggest 10% of income
@@ -851,11 +1054,11 @@ def generate_proactive_nudges(
     # Filter transactions by period
     this_week_txs = [
         t for t in transactions
-        if datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', '')) >= week_start
+        if _is_since(t, week_start)
     ]
     this_month_txs = [
         t for t in transactions
-        if datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', '')) >= month_start
+        if _is_since(t, month_start)
     ]
     
     # Calculate weekly totals
@@ -924,7 +1127,7 @@ def generate_proactive_nudges(
     if avg_daily_expense > 0:
         today_txs = [
             t for t in transactions
-            if datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', '')) >= today_start
+            if _is_since(t, today_start)
         ]
         today_expenses = sum(t['amount'] for t in today_txs if t['type'] == 'expense')
         
@@ -943,7 +1146,7 @@ def generate_proactive_nudges(
     recent_settlements = [
         t for t in transactions
         if t.get('type') in ['payment_received', 'payment_made']
-        and datetime.fromisoformat(t['date'].replace('Z', '+00:00').replace('+00:00', '')) >= today_start - timedelta(days=1)
+        and _is_since(t, today_start - timedelta(days=1))
     ]
     
     for payment in recent_settlements[:3]:  # Limit to 3 celebrations